@@ -0,0 +1,44 @@
+"""Benchmarks for the load, transform, project, clip and paint stages.
+
+Every workload (a bundled .obj file, the bundled .oml files, or a
+synthetic scene) is loaded into a fresh Scene, fitted into the window, and
+run through each stage in turn. Stages are timed separately, and painting
+is done onto an offscreen cairo ImageSurface, hence Gtk is never loaded.
+
+Run the suite from the repository's root:
+
+    python -m benchmarks [--repeat N] [--scenes NAME...] [--output FILE]
+
+The results are written as JSON, so that runs can be compared over time:
+
+    {
+        "metadata": {"python": ..., "numpy": ..., "cairo": ..., ...},
+        "workloads": {
+            "teapot": {
+                "objects": 1,
+                "stages": {
+                    "load": {
+                        "seconds": {"min": ..., "median": ..., "runs": []},
+                        "vertices": ..., "faces": ..., "segments": ...,
+                        "vertices_per_second": ..., ...,
+                        "peak_memory_bytes": ...
+                    },
+                    ...
+                }
+            },
+            ...
+        }
+    }
+
+Stages that don't apply to a workload are null; e.g. `load_cached` for
+workloads that read no cache. Throughputs are computed from the fastest
+run. Peak memory is measured by tracemalloc in an extra run, so that
+tracing doesn't skew the timings; it accounts for Python and numpy
+allocations, but not for cairo's.
+
+Modules
+-------
+    stages
+    workloads
+
+"""
@@ -0,0 +1,168 @@
+"""Run the benchmarks and write their results as JSON.
+
+See the package's documentation for the layout of the results.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import cairo
+import numpy as np
+
+from util import Logger, LogLevel
+from .stages import STAGES
+from .workloads import bundled_workloads, synthetic_workloads
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""Root of the repository, where the bundled files are."""
+
+COUNTS = ("vertices", "faces", "segments")
+
+
+def _metadata() -> 'dict':
+    """Describe the environment the benchmarks ran in."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(
+            datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cairo": cairo.version,
+        "platform": platform.platform(),
+    }
+
+
+def _stages(workload: 'Workload') -> 'list':
+    """Stages that apply to `workload`."""
+    return [stage for stage in STAGES
+            if workload.cached or not stage.cached_only]
+
+
+def _run(workload: 'Workload', resolution: 'tuple',
+         traced: 'bool') -> 'tuple':
+    """Run every stage once, in a fresh working directory.
+
+    Returns
+    -------
+        tuple : (objects, stages), where objects is the number of objects
+        loaded, and stages maps each stage's name to its counts along with
+        either its duration in seconds, or its peak memory in bytes if
+        `traced`.
+
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="zbench") as workdir:
+        if workload.prepare is not None:
+            workload.prepare(workdir)
+        context = SimpleNamespace(
+            workload=workload, workdir=workdir, resolution=resolution)
+        for stage in _stages(workload):
+            if stage.setup is not None:
+                stage.setup(context)
+            if traced:
+                tracemalloc.reset_peak()
+                start = tracemalloc.get_traced_memory()[0]
+                counts = stage.run(context)
+                counts["peak"] = tracemalloc.get_traced_memory()[1] - start
+            else:
+                start = time.perf_counter()
+                counts = stage.run(context)
+                counts["seconds"] = time.perf_counter() - start
+            results[stage.name] = counts
+    return len(context.scene) - 1, results
+
+
+def benchmark(workload: 'Workload', repeat: 'int',
+              resolution: 'tuple') -> 'dict':
+    """Time every stage of `workload` `repeat` times, and trace it once.
+
+    Notes
+    -----
+        Throughputs are computed from the fastest run of each stage.
+        Stages that don't apply to `workload` are reported as None.
+
+    """
+    runs = [_run(workload, resolution, False)[1] for _ in range(repeat)]
+    tracemalloc.start()
+    try:
+        objects, traced = _run(workload, resolution, True)
+    finally:
+        tracemalloc.stop()
+
+    stages = dict.fromkeys(stage.name for stage in STAGES)
+    for stage in _stages(workload):
+        seconds = [run[stage.name]["seconds"] for run in runs]
+        fastest = min(seconds)
+        result = {"seconds": {"min": fastest,
+                              "median": statistics.median(seconds),
+                              "runs": seconds}}
+        for count in COUNTS:
+            n = runs[0][stage.name][count]
+            result[count] = n
+            if n is not None:
+                result[count + "_per_second"] = \
+                    n / fastest if fastest > 0 else None
+        result["peak_memory_bytes"] = traced[stage.name]["peak"]
+        stages[stage.name] = result
+    return {"objects": objects, "stages": stages}
+
+
+def main(argv: 'list' = None) -> 'int':
+    """Command line entry point; returns the exit status."""
+    workloads = bundled_workloads(ROOT) + synthetic_workloads(ROOT)
+    names = [workload.name for workload in workloads]
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the load, transform, project, clip and paint "
+                    "stages, and write the results as JSON.")
+    parser.add_argument("--scenes", nargs="+", choices=names, default=names,
+                        metavar="NAME",
+                        help="workloads to run: " + ", ".join(names))
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timed runs of each workload (default: 5)")
+    parser.add_argument("--size", type=int, nargs=2, default=(1000, 1000),
+                        metavar=("W", "H"),
+                        help="resolution painted at (default: 1000 1000)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write results to FILE instead of stdout")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    Logger.set_level(LogLevel.ERRO)
+
+    results = {"metadata": _metadata(), "workloads": {}}
+    results["metadata"].update(repeat=args.repeat, size=args.size)
+    for workload in workloads:
+        if workload.name in args.scenes:
+            print("running", workload.name, file=sys.stderr)
+            results["workloads"][workload.name] = benchmark(
+                workload, args.repeat, tuple(args.size))
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
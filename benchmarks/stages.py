@@ -0,0 +1,154 @@
+"""Stages of the rendering pipeline, as timed by the benchmarks.
+
+Each stage has an untimed setup and a timed run, both taking the
+`context` of the current run. A context is created per run, with the
+workload, its working directory and the resolution; stages store what
+later stages need in it (`scene`, `projections`).
+
+    load          Add the workload's objects to a new Scene, parsing
+                  every file.
+    load_cached   Same, reading every file from the cache left by `load`;
+                  skipped for workloads that aren't `cached`.
+    transform     Rotate every object, and compute its transformed points.
+    project       Project every object through the window.
+    clip          Clip the projected wireframes; tessellate and clip the
+                  curves and surfaces.
+    paint         Paint the visible objects onto a cairo ImageSurface.
+
+Every run returns the number of vertices, faces and segments it went
+through; counts that don't apply to a stage are None. The segments of
+`clip` are the edges of the clipped faces, shared edges included, whereas
+those of `paint` are the edges actually stroked, at the level of detail
+drawn.
+
+Classes
+-------
+    Stage
+
+"""
+from collections import namedtuple
+
+import cairo
+
+from client.models import Curve, Surface, Wireframe
+from client.object_painter import ObjectPainter
+from client.render import fit
+from client.scene import Scene
+from util.clipping import clip_wireframe
+
+
+Stage = namedtuple("Stage", ["name", "setup", "run", "cached_only"])
+Stage.__doc__ = """Stage of the pipeline; `setup` is None if not needed.
+
+Stages that are `cached_only` are skipped for workloads that don't read
+from a cache.
+"""
+
+ANGLES = (0.1, 0.2, 0.3)
+"""Angles, in radians, by which every object is rotated."""
+
+
+def _counts(vertices=None, faces=None, segments=None) -> 'dict':
+    """Number of vertices, faces and segments processed by a stage."""
+    return {"vertices": vertices, "faces": faces, "segments": segments}
+
+
+def _objects(scene: 'Scene') -> 'list':
+    """Objects of `scene`, but the window."""
+    return [obj for obj in scene.objects if obj is not scene.window]
+
+
+def _load(context: 'SimpleNamespace') -> 'dict':
+    """Add the workload's objects to a new scene."""
+    context.scene = Scene()
+    context.workload.load(context.scene, context.workdir)
+    objects = _objects(context.scene)
+    return _counts(
+        vertices=sum(len(obj.base_points) for obj in objects),
+        faces=sum(len(obj.faces) for obj in objects
+                  if isinstance(obj, Wireframe)))
+
+
+def _frame(context: 'SimpleNamespace'):
+    """Fit the scene into the window, at the context's resolution."""
+    context.scene.window.resolution = context.resolution
+    fit(context.scene)
+
+
+def _transform(context: 'SimpleNamespace') -> 'dict':
+    """Rotate every object around its center."""
+    vertices = 0
+    for obj in _objects(context.scene):
+        obj.rotate(*ANGLES)
+        context.scene.changed(obj)
+        vertices += len(obj.points)
+    return _counts(vertices=vertices)
+
+
+def _project(context: 'SimpleNamespace') -> 'dict':
+    """Project every object through the window."""
+    window = context.scene.window
+    context.projections = {
+        obj.name: obj.projected(window) for obj in _objects(context.scene)}
+    return _counts(vertices=sum(
+        len(points) for points in context.projections.values()))
+
+
+def _clip(context: 'SimpleNamespace') -> 'dict':
+    """Clip wireframes; tessellate and clip curves and surfaces.
+
+    Notes
+    -----
+        Curves and surfaces are tessellated to the window's resolution
+        before being clipped, hence they are projected again by `update`.
+
+    """
+    window = context.scene.window
+    faces = segments = 0
+    for obj in _objects(context.scene):
+        if isinstance(obj, Wireframe):
+            _, clipped = clip_wireframe(
+                context.projections[obj.name], obj.faces)
+            faces += len(obj.faces)
+            segments += len(clipped.indices)
+        else:
+            obj.update(window)
+            if isinstance(obj, (Curve, Surface)):
+                segments += len(obj.cached_segments[0])
+    return _counts(faces=faces, segments=segments)
+
+
+def _refresh(context: 'SimpleNamespace'):
+    """Bring the cached points of the visible objects up to date."""
+    context.objects = [obj for obj in context.scene.display_file
+                       if obj is not context.scene.window]
+
+
+def _paint(context: 'SimpleNamespace') -> 'dict':
+    """Paint the visible objects onto an offscreen surface."""
+    width, height = context.resolution
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+    cr.translate(-10, -10)
+    ObjectPainter(cr, context.resolution).paint_objects(context.objects)
+    surface.flush()
+    segments = 0
+    for obj in context.objects:
+        if isinstance(obj, Wireframe):
+            segments += len(obj.cached_edges)
+        elif isinstance(obj, (Curve, Surface)):
+            segments += len(obj.cached_segments[0])
+        else:
+            segments += 1
+    return _counts(segments=segments)
+
+
+STAGES = (
+    Stage("load", None, _load, False),
+    Stage("load_cached", None, _load, True),
+    Stage("transform", _frame, _transform, False),
+    Stage("project", None, _project, False),
+    Stage("clip", None, _clip, False),
+    Stage("paint", _refresh, _paint, False),
+)
+"""Stages, in the order they are run."""
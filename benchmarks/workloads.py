@@ -0,0 +1,196 @@
+"""Scenes to be benchmarked.
+
+A workload adds its objects to a Scene through an Executor, as the
+clients do. Workloads that read files are given a fresh working directory
+on every run, so that loading is never served by a cache left by a
+previous run.
+
+Classes
+-------
+    Workload
+
+Functions
+---------
+    bundled_workloads
+    synthetic_workloads
+    torus_mesh
+
+"""
+from collections import namedtuple
+import os
+import shutil
+
+import numpy as np
+
+from client.executor import Executor
+from client.interpreter import Interpreter
+from util import DotObjParser, DotOmlParser, FaceArray
+
+
+Workload = namedtuple("Workload", ["name", "prepare", "load", "cached"])
+Workload.__doc__ = """Named scene.
+
+`prepare(workdir)`, if not None, writes the workload's input files into
+`workdir`, an empty directory; it is not timed. `load(scene, workdir)`
+then adds the workload's objects to `scene`, and may use `workdir` for
+caches. `cached` tells whether loading again reads from such caches (an
+ObjCache or compiled .omlc files), rather than just repeating the work.
+"""
+
+OBJ_FILES = ("teapot", "cessna", "basicman", "cristo")
+"""Bundled .obj files, in the obj-files directory."""
+
+OML_FILES = ("curves", "surface", "triangle")
+"""Bundled .oml files, in the oml-files directory."""
+
+TORUS_SIZES = (64, 256)
+"""Quads along each direction of the synthetic torus meshes."""
+
+TILES = (4, 8)
+"""Copies of the teapot along each direction of the synthetic grids."""
+
+CURVES = (100, 400)
+"""Number of curves, and of surfaces, of the synthetic .oml scripts."""
+
+
+def _load_obj(path: 'str') -> 'function':
+    """Load a .obj file, caching it in the working directory."""
+    def load(scene: 'Scene', workdir: 'str'):
+        DotObjParser(Executor(scene), workdir).compile_obj_file(path)
+    return load
+
+
+def _copy_files(paths: 'list') -> 'function':
+    """Copy files into the working directory."""
+    def prepare(workdir: 'str'):
+        for path in paths:
+            shutil.copy(path, workdir)
+    return prepare
+
+
+def _load_oml(names: 'list') -> 'function':
+    """Interpret .oml files of the working directory, compiling them there."""
+    def load(scene: 'Scene', workdir: 'str'):
+        parser = DotOmlParser(Interpreter(Executor(scene)))
+        for name in names:
+            parser.interpret_oml_file(os.path.join(workdir, name))
+    return load
+
+
+def bundled_workloads(root: 'str') -> 'list':
+    """Workloads of the .obj and .oml files bundled in `root`."""
+    workloads = [
+        Workload(name, None, _load_obj(
+            os.path.join(root, "obj-files", name + ".obj")), True)
+        for name in OBJ_FILES]
+    names = [name + ".oml" for name in OML_FILES]
+    workloads.append(Workload(
+        "oml-files",
+        _copy_files([os.path.join(root, "oml-files", name)
+                     for name in names]),
+        _load_oml(names),
+        True))
+    return workloads
+
+
+def torus_mesh(n: 'int', radius: 'float' = 200,
+               tube: 'float' = 80) -> 'tuple':
+    """Torus of `n` by `n` quads.
+
+    Returns
+    -------
+        tuple : (points, faces), where points is an (n*n, 4) array of
+        homogeneous coordinates and faces is a FaceArray.
+
+    """
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    u, v = np.meshgrid(angles, angles, indexing="ij")
+    points = np.ones((n * n, 4))
+    points[:, 0] = ((radius + tube * np.cos(v)) * np.cos(u)).ravel()
+    points[:, 1] = ((radius + tube * np.cos(v)) * np.sin(u)).ravel()
+    points[:, 2] = (tube * np.sin(v)).ravel()
+
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    i1, j1 = (i + 1) % n, (j + 1) % n
+    quads = np.stack([i * n + j, i1 * n + j, i1 * n + j1, i * n + j1],
+                     axis=-1).reshape(-1, 4)
+    offsets = np.arange(0, quads.size + 1, 4, dtype=np.int32)
+    return points, FaceArray(quads.astype(np.int32).ravel(), offsets)
+
+
+def _load_torus(n: 'int') -> 'function':
+    """Add a torus of `n` by `n` quads."""
+    def load(scene: 'Scene', workdir: 'str'):
+        points, faces = torus_mesh(n)
+        Executor(scene).add(name="torus", points=points, faces=faces,
+                            color=(0., 0., 0.), obj_type="Wireframe")
+    return load
+
+
+def _load_tiles(path: 'str', k: 'int') -> 'function':
+    """Add a `k` by `k` grid of copies of the meshes of a .obj file."""
+    def load(scene: 'Scene', workdir: 'str'):
+        executor = Executor(scene)
+        meshes = DotObjParser(executor, workdir).load_obj_file(path)
+        lo = np.min([points.min(axis=0) for _, points, _, _ in meshes], 0)
+        hi = np.max([points.max(axis=0) for _, points, _, _ in meshes], 0)
+        step = 1.2 * (hi - lo)[:2]
+        with executor.batch():
+            for i in range(k):
+                for j in range(k):
+                    for group, points, indices, offsets in meshes:
+                        points = points.copy()
+                        points[:, :2] += step * (i, j)
+                        executor.add(
+                            name="tile_{}_{}_{}".format(i, j, group),
+                            points=points,
+                            faces=FaceArray(indices, offsets),
+                            color=(0., 0., 0.),
+                            obj_type="Wireframe")
+    return load
+
+
+def _curves_script(n: 'int') -> 'str':
+    """Script adding `n` curves and `n` surfaces, scattered on a grid."""
+    rng = np.random.default_rng(n)
+    side = int(np.ceil(np.sqrt(n)))
+    lines = []
+    for i in range(n):
+        x, y = 100 * (i % side), 100 * (i // side)
+        curve = rng.uniform(0, 80, (7, 3)) + (x, y, 0)
+        surface = rng.uniform(0, 80, (16, 3)) + (x, y, 100)
+        lines.append("addc(c{},{},bezier)".format(i, ";".join(
+            "{:.2f},{:.2f},{:.2f}".format(*p) for p in curve)))
+        lines.append("adds(s{},{},bspline,bspline)".format(i, ";".join(
+            "{:.2f},{:.2f},{:.2f}".format(*p) for p in surface)))
+    return "\n".join(lines) + "\n"
+
+
+def _write_curves(n: 'int') -> 'function':
+    """Write a script adding `n` curves and `n` surfaces."""
+    def prepare(workdir: 'str'):
+        with open(os.path.join(workdir, "curves.oml"), "w") as oml:
+            oml.write(_curves_script(n))
+    return prepare
+
+
+def synthetic_workloads(root: 'str') -> 'list':
+    """Scaled-up workloads: large meshes, many objects, many curves.
+
+    See also
+    --------
+        `TORUS_SIZES`
+        `TILES`
+        `CURVES`
+
+    """
+    teapot = os.path.join(root, "obj-files", "teapot.obj")
+    return (
+        [Workload("torus{}".format(n), None, _load_torus(n), False)
+         for n in TORUS_SIZES] +
+        [Workload("teapots{}x{}".format(k, k), None, _load_tiles(teapot, k),
+                  True)
+         for k in TILES] +
+        [Workload("curves{}".format(n), _write_curves(n),
+                  _load_oml(["curves.oml"]), True)
+         for n in CURVES])
@@ -1,12 +1,13 @@
-"""This modules provides a write-only interface to ObjectStore.
+"""This modules provides a write-only interface to a Scene.
 
 The interface is the following:
 
-- add: Add new object to ObjectStorage.
-- remove: Remove object from ObjectStorage.
+- add: Add new object to the Scene.
+- remove: Remove object from the Scene.
 - translate: Translate object.
 - scale: Scale object.
 - rotate: Rotate Object.
+- batch: Group operations, deferring their side effects.
 
 Notes
 -----
@@ -14,19 +15,20 @@ Notes
     object does not exist, or if an attempt is made at adding an object whose
     name is already in use.
 
-    Also, all procedures in this interface will force the viewport to
-    be redrawn.
+    Also, if there is a viewport, all procedures in this interface will
+    force it to be redrawn. Adding or removing objects invalidates all of
+    the viewport's layers, whereas transforming an object only invalidates
+    the layer it is moved to. Without a viewport (e.g. when rendering
+    offscreen), the Executor doesn't depend on Gtk at all.
 
 """
+from contextlib import contextmanager, ExitStack
 
 import numpy as np
 
 from util import (Logger, LogLevel)
 from .models import (Point, Line, Wireframe, Curve, Surface)
 
-from .object_store import ObjectStore
-from .gui.viewport import Viewport
-
 
 def _warn_undefined_object(method: 'function'):
     """Log the attempt of accessing an object that does not exist."""
@@ -38,18 +40,84 @@ def _warn_undefined_object(method: 'function'):
     return wrapper
 
 
+def _needs_redraw(method: 'function'):
+    """Indicate that a method needs redraw to take visual effect.
+
+    Decorate a method so that it queues a viewport redraw after finishing
+    executing, provided that the method modified the scene.
+
+    Notes
+    -----
+        The decorated class must have _obj_store and _viewport attributes
+        for the introspection to work; no redraw is queued if _viewport
+        is None.
+
+        `method` can have any number of args and kwargs.
+
+    See also
+    --------
+        `Scene.generation`
+        `Viewport.queue_draw`
+
+    """
+    def wrapper(cls, *args, **kwargs):
+        generation = cls._obj_store.generation
+        method(cls, *args, **kwargs)
+        if cls._viewport is not None and \
+                cls._obj_store.generation != generation:
+            cls._viewport.queue_draw()
+    return wrapper
+
+
 class Executor:
-    """Realization of write-only interface to ObjectStore."""
+    """Realization of write-only interface to a Scene."""
 
-    def __init__(self, obj_store: 'ObjectStore', viewport: 'Viewport'):
+    def __init__(self, obj_store: 'Scene', viewport: 'Viewport' = None):
         """Construct Executor."""
         self._obj_store = obj_store
         self._viewport = viewport
 
-    @Viewport.needs_redraw
+    @contextmanager
+    def batch(self):
+        """Execute a group of operations as a single change.
+
+        Within the block, no redraw is queued and the Scene doesn't log
+        (nor does an ObjectStore append rows); at the end of it, a summary
+        is logged and a single redraw is queued. Objects are
+        projected by the next redraw, as always.
+
+        Examples
+        --------
+            with executor.batch():
+                for params in objects:
+                    executor.add(**params)
+
+        See also
+        --------
+            `Scene.batch`
+            `Viewport.hold_redraw`
+
+        """
+        with ExitStack() as stack:
+            if self._viewport is not None:
+                stack.enter_context(self._viewport.hold_redraw())
+            stack.enter_context(self._obj_store.batch())
+            yield self
+
+    def _invalidate(self):
+        """Invalidate all of the viewport's layers, if there is one."""
+        if self._viewport is not None:
+            self._viewport.invalidate()
+
+    def _manipulate(self, name: 'str'):
+        """Move object `name` to the viewport's active layer, if any."""
+        if self._viewport is not None:
+            self._viewport.manipulate(name)
+
+    @_needs_redraw
     @_warn_undefined_object
     def add(self, **kwargs):
-        """Attempt to add object to ObjectStore."""
+        """Attempt to add object to the Scene."""
         REQUIRED_PARAMS = {
             "Point": [],
             "Line": [],
@@ -83,30 +151,34 @@ class Executor:
         }
 
         self._obj_store[name] = call_constructor[obj_type]()
+        self._invalidate()
 
-    @Viewport.needs_redraw
+    @_needs_redraw
     @_warn_undefined_object
     def remove(self, name: 'str'):
-        """Attempt to remove object from ObjectStore."""
+        """Attempt to remove object from the Scene."""
         del self._obj_store[name]
+        self._invalidate()
 
-    @Viewport.needs_redraw
+    @_needs_redraw
     @_warn_undefined_object
     def translate(self, selected: 'str', dx: 'int', dy: 'int', dz: 'int'):
         """Attempt to translate point."""
         obj = self._obj_store[selected]
         obj.translate(dx, dy, dz)
         self._obj_store.changed(obj)
+        self._manipulate(selected)
 
-    @Viewport.needs_redraw
+    @_needs_redraw
     @_warn_undefined_object
     def scale(self, selected: 'str', factor: 'int'):
         """Attempt to scale object."""
         obj = self._obj_store[selected]
         obj.scale(factor)
         self._obj_store.changed(obj)
+        self._manipulate(selected)
 
-    @Viewport.needs_redraw
+    @_needs_redraw
     @_warn_undefined_object
     def rotate(self, selected: 'str', x_angle: 'float', y_angle: 'float',
                z_angle: 'float', point: 'np.array'):
@@ -114,3 +186,4 @@ class Executor:
         obj = self._obj_store[selected]
         obj.rotate(x_angle, y_angle, z_angle, point)
         self._obj_store.changed(obj)
+        self._manipulate(selected)
@@ -0,0 +1,94 @@
+"""Module that builds the GTK z-client from its glade file.
+
+Classes
+-------
+    GtkClient
+
+"""
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gtk
+
+from .executor import Executor
+from .interpreter import Interpreter
+from .object_store import ObjectStore
+
+from .gui import *
+
+from util import DotObjParser, DotOmlParser
+
+
+class GtkClient:
+    """Build user interface from glade file and inject dependencies."""
+
+    def __init__(self):
+        """Initialize gtk client."""
+        self._has_quit = False
+        self._builder = Gtk.Builder()
+        self._builder.add_from_file("glade/gtk_client.glade")
+
+        obj_store = ObjectStore()
+        obj_view = ObjectView(
+            obj_store, self._builder.get_object("object_list"))
+
+        viewport = Viewport(
+            self._builder.get_object("viewport_drawing_area"), obj_store)
+
+        executor = Executor(obj_store, viewport)
+        dot_obj_parser = DotObjParser(executor)
+
+        interpreter = Interpreter(executor)
+        dot_oml_parser = DotOmlParser(interpreter)
+
+        Console(self._builder.get_object("console_text_view"), interpreter)
+
+        create_obj_dialog = CreateObjectDialog(
+            self._builder.get_object("create_object_dialog"),
+            self._builder.get_object("create_object_dialog_name_field"),
+            self._builder.get_object("create_object_dialog_type_field"),
+            self._builder.get_object("create_object_dialog_points_field"),
+            self._builder.get_object("create_object_dialog_color_field"),
+            obj_view,
+            interpreter)
+        file_chooser_dialog = Gtk.FileChooserDialog(
+            "Please choose file",
+            self._builder.get_object("main_window"),  # Modal for
+            Gtk.FileChooserAction.OPEN,
+            (Gtk.STOCK_CANCEL,
+             Gtk.ResponseType.CANCEL,
+             Gtk.STOCK_OPEN, Gtk.ResponseType.OK))
+        menu_bar = MenuBar(
+            create_obj_dialog,
+            file_chooser_dialog,
+            executor,
+            dot_obj_parser,
+            dot_oml_parser)
+
+        control_menu = ControlMenu(executor,
+                                   obj_view,
+                                   self._builder.get_object("degrees_entry"),
+                                   self._builder.get_object("point_entry"),
+                                   self._builder.get_object("step_entry"),
+                                   self._builder.get_object(
+                                       "center_of_world_radio_button"))
+        # Handlers
+        handlers = {
+            "on_delete_event": lambda _, __: self.quit(),
+            # Menu bar
+            "on_menu_bar_quit": lambda _: self.quit(),
+        }
+        handlers.update(create_obj_dialog.handlers)
+        handlers.update(control_menu.handlers)
+        handlers.update(menu_bar.handlers)
+        handlers.update(viewport.handlers)
+        self._builder.connect_signals(handlers)
+
+    def quit(self):
+        """Indicate that the user has quit."""
+        self._has_quit = True
+
+    def run(self):
+        """Process Gtk events until `quit()` is called."""
+        self._builder.get_object("main_window").show_all()
+        while not self._has_quit:
+            Gtk.main_iteration_do(False)
@@ -5,6 +5,8 @@ Classes
     Viewport
 
 """
+from contextlib import contextmanager
+
 import cairo
 
 from ..object_painter import ObjectPainter
@@ -17,6 +19,14 @@ class Viewport:
     The actual Gtk.DrawingArea is 20 pixels larger in both width and height
     so that the clipping algorithms implemented in this project can be tested.
 
+    Objects are rasterized into two offscreen layers: the active layer holds
+    the object being manipulated along with every object added after it,
+    and the static layer holds the ones added before it. Objects are thus
+    still drawn in insertion order. A draw composites both layers and only
+    re-rasterizes the ones that were invalidated, hence moving a small
+    object in front of a heavy mesh does not stroke the mesh again. Layers
+    are invalidated by the Executor through `invalidate` and `manipulate`.
+
     Notes
     -----
         This GUI Component handles the following signals:
@@ -35,7 +45,12 @@ class Viewport:
         self._drawing_area = drawing_area
         self._obj_store = obj_store
         self._surface = None
+        self._static_layer = None
+        self._active_layer = None
+        self._active = None
+        self._held = 0
         self._resolution = resolution
+        self._obj_store.window.resolution = resolution
         self._drawing_area.set_size_request(
             self._resolution[0] + 20, self._resolution[1] + 20)
         self.handlers = {
@@ -43,25 +58,61 @@ class Viewport:
             "on_configure": self._on_configure,
         }
 
-    @staticmethod
-    def needs_redraw(method: 'function'):
-        """Indicate that a method needs redraw to take visual effect.
+    def queue_draw(self):
+        """Queue a redraw of the drawing area, unless redraws are held.
+
+        See also
+        --------
+            `hold_redraw`
 
-        Decorate a method so that it queues a viewport redraw after
-        finishing executing.
+        """
+        if self._held == 0:
+            self._drawing_area.queue_draw()
+
+    @contextmanager
+    def hold_redraw(self):
+        """Hold redraws until the end of the block, then queue at most one.
 
         Notes
         -----
-            The decorated class must have a _viewport attribute for
-            the introspection to work.
+            A redraw is queued at the end of the outermost block, provided
+            that the object store was modified within it.
 
-            `method` can have any number of args and kwargs.
+        """
+        generation = self._obj_store.generation
+        self._held += 1
+        try:
+            yield self
+        finally:
+            self._held -= 1
+            if self._held == 0 and self._obj_store.generation != generation:
+                self._drawing_area.queue_draw()
+
+    def invalidate(self):
+        """Re-rasterize all layers on the next draw."""
+        self._static_layer = None
+        self._active_layer = None
+
+    def manipulate(self, name: 'str'):
+        """Re-rasterize object `name`, moving it to the active layer.
+
+        Notes
+        -----
+            The objects added after `name` are moved to the active layer as
+            well, so that they are still drawn above it; manipulating the
+            most recently added object is thus the cheapest.
+
+            Manipulating the window changes the view of every object, hence
+            it invalidates all layers.
 
         """
-        def wrapper(cls, *args, **kwargs):
-            method(cls, *args, **kwargs)
-            cls._viewport._drawing_area.queue_draw()
-        return wrapper
+        if name == self._obj_store.window.name:
+            self.invalidate()
+        elif name == self._active:
+            self._active_layer = None
+        else:
+            self._active = name
+            self.invalidate()
 
     def clear(self):
         """Clear `_surface`; paints it white."""
@@ -72,7 +123,8 @@ class Viewport:
     def _on_configure(self, wid: 'Gtk.Widget', evt: 'Gdk.EventConfigure'):
         """Handle on_configure signal.
 
-        Create surface and paint it white.
+        Create surface and paint it white, and let the window know the
+        new resolution.
 
         Notes
         -----
@@ -88,6 +140,8 @@ class Viewport:
             width,
             height)
         self._resolution = (width - 20, height - 20)
+        self._obj_store.window.resolution = self._resolution
+        self.invalidate()
         Logger.log(LogLevel.INFO, "viewport.config() at ({},{})"
                    .format(width, height))
         self.clear()
@@ -95,19 +149,40 @@ class Viewport:
     def _on_draw(self, wid: 'Gtk.Widget', cr: 'Cairo.Context'):
         """Handle on_draw signal.
 
-        Instantiate an ObjectPainter based on the drawing area's current
-        resolution, and use it to paint all visible objects.
-
-        Notes
-        -----
-            LineCap.ROUND is necessary for drawing points.
+        Rasterize the invalidated layers and composite all of them over the
+        white background.
 
         """
+        objects = self._obj_store.display_file
+        split = len(objects)
+        if self._active in self._obj_store:
+            active = self._obj_store.order(self._active)
+            split = next((i for i, obj in enumerate(objects)
+                          if self._obj_store.order(obj.name) >= active),
+                         split)
+        if self._static_layer is None:
+            self._static_layer = self._rasterize(objects[:split])
+        if self._active_layer is None:
+            self._active_layer = self._rasterize(objects[split:])
+
         cr.set_source_surface(self._surface, 0, 0)
         cr.paint()
-        cr.set_line_cap(cairo.LineCap.ROUND)
-        painter = ObjectPainter(cr, self._resolution)
-        for obj in self._obj_store.display_file:
-            cr.set_source_rgb(*obj.color)
-            cr.set_line_width(obj.thickness)
-            obj.accept(painter)
+        cr.set_source_surface(self._static_layer, 0, 0)
+        cr.paint()
+        cr.set_source_surface(self._active_layer, 0, 0)
+        cr.paint()
+
+    def _rasterize(self, objects: 'list') -> 'cairo.Surface':
+        """Paint `objects` onto a new transparent layer.
+
+        Instantiate an ObjectPainter based on the drawing area's current
+        resolution, and use it to paint the objects.
+
+        """
+        layer = self._surface.create_similar(
+            cairo.CONTENT_COLOR_ALPHA,
+            self._resolution[0] + 20,
+            self._resolution[1] + 20)
+        painter = ObjectPainter(cairo.Context(layer), self._resolution)
+        painter.paint_objects(objects)
+        return layer
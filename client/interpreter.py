@@ -1,7 +1,7 @@
 """This module provides an interpreter for a toy language.
 
 The interpreter parses object manipulation language (.oml) files.
-It isn't efficient, but is easier (and faster) to manipulate objects
+It is easier (and faster) to manipulate objects
 through the console, than it is to use the graphical user interface.
 
 The implemented commands are:
@@ -14,7 +14,9 @@ The implemented commands are:
 
 (*) Parameters followed by ? are considered optional.
 
-The language is regular and is parsed by pattern matching.
+The language is regular. Commands are parsed in a single pass by
+`util.oml_files.parse_command`, and executed by dispatching on their
+keyword.
 
 Classes
 -------
@@ -28,35 +30,28 @@ import numpy as np
 
 from .models import Interpolator
 from util import Logger, LogLevel
+from util.oml_files import OmlSyntaxError, parse_command
 
 
 name = r"[a-zA-Z]+[a-zA-Z0-9_]*"
 floating = r"-?\d+.?\d*"
 points = r"({0},{0},{0};)*{0},{0},{0}".format(floating)
-natural = r"[0-9]+"
-face = r"(({0}-)*{0})".format(natural)
-faces = r"({0};)*{0}".format(face)
-interpolator = r"(bezier|bspline)"
 
 NAME_PATTERN = re.compile(r"^{0}$".format(name))
 POINTS_PATTERN = re.compile(r"^{0}$".format(points))
 
-ADD_PATTERN = re.compile(  # TEMP: Do not break line earlier
-    r"^add(?P<type>[clpsw])\((?P<name>{0}),(?P<points>{1})(,(?P<bmatu>{2}))?(,(?P<bmatv>{2}))?(,(?P<faces>{3}))?\)$".format(
-            name, points, interpolator, faces))
+OBJ_TYPES = {
+    "p": "Point",
+    "l": "Line",
+    "c": "Curve",
+    "s": "Surface",
+    "w": "Wireframe",
+}
 
-REMOVE_PATTERN = re.compile(
-    r"^remove\((?P<name>{0})\)$".format(name))
-
-TRANSLATE_PATTERN = re.compile(
-    r"^translate\((?P<name>{0}),(?P<dx>{1}),(?P<dy>{1}),(?P<dz>{1})\)$".format(
-        name, floating, floating))
-
-SCALE_PATTERN = re.compile(
-    r"^scale\((?P<name>{0}),(?P<factor>{1})\)$".format(name, floating))
-
-ROTATE_PATTERN = re.compile(
-    r"^rotate\((?P<name>{0}),(?P<x_angle>{1}),(?P<y_angle>{1}),(?P<z_angle>{1})\)$".format(name, floating))
+INTERPOLATORS = {
+    "bezier": Interpolator.BEZIER,
+    "bspline": Interpolator.BSPLINE,
+}
 
 
 class Interpreter:
@@ -66,13 +61,18 @@ class Interpreter:
         """Construct interpreter."""
         self._executor = executor
         self._handler = {
-            ADD_PATTERN: self._add,
-            TRANSLATE_PATTERN: self._translate,
-            SCALE_PATTERN: self._scale,
-            ROTATE_PATTERN: self._rotate,
-            REMOVE_PATTERN: self._remove,
+            "add": self._add,
+            "translate": self._translate,
+            "scale": self._scale,
+            "rotate": self._rotate,
+            "remove": self._remove,
         }
 
+    @property
+    def executor(self) -> 'Executor':
+        """Executor that carries out the interpreted commands."""
+        return self._executor
+
     def faces_as_list(self, string: 'str') -> 'list':
         """Convert raw string into list of faces (each face is a pair)."""
         return [
@@ -89,12 +89,17 @@ class Interpreter:
         return (float(lis[0]), float(lis[1]), float(lis[2]))
 
     def interpret(self, string):
-        """Interpret command by pattern matching."""
-        for pattern in self._handler.keys():
-            match = pattern.match(string)
-            if match:
-                return self._handler[pattern](match)
-        Logger.log(LogLevel.WARN, "Invalid command!")
+        """Parse and execute a single command."""
+        try:
+            command = parse_command(string.strip())
+        except OmlSyntaxError as error:
+            Logger.log(LogLevel.WARN, "Invalid command! {}".format(error))
+            return None
+        return self.execute(command)
+
+    def execute(self, command: 'OmlCommand'):
+        """Execute a parsed command."""
+        return self._handler[command.keyword](command)
 
     def validate_object(self, name, points):
         """Validate object.
@@ -111,63 +116,41 @@ class Interpreter:
         if not POINTS_PATTERN.match(points):
             raise RuntimeError("Invalid list of points format!")
 
-    def _add(self, match: 'MatchObject'):
+    def _add(self, command: 'OmlCommand'):
         """Execute `add`."""
-        pass
-        name = match.group("name")
-        points = match.group("points")
-        color = (0., 0., 0.)
-        obj_type = match.group("type")
-        try:
-            self.validate_object(name, points)  # NOTE: could be improved
-        except RuntimeError as error:
-            Logger.log(LogLevel.ERRO, error)
-            return None
-        params = {'name': name, 'points': self.points_as_list(points),
-                  'color': color}
-        if obj_type == "p":
-            params['obj_type'] = "Point"
-        elif obj_type == "l":
-            params['obj_type'] = "Line"
-        elif obj_type == "c":
-            params['obj_type'] = "Curve"
-            params['bmatu'] = Interpolator.BEZIER if \
-                match.group("bmatu") == "bezier" else Interpolator.BSPLINE
+        obj_type = command.options[0]
+        interpolators = [INTERPOLATORS[interpolator]
+                         for interpolator in command.options[1:]]
+        interpolators += [Interpolator.BSPLINE] * (2 - len(interpolators))
+        points = np.ones((len(command.values), 4))
+        points[:, :3] = command.values
+        params = {'name': command.name, 'points': points,
+                  'color': (0., 0., 0.), 'obj_type': OBJ_TYPES[obj_type]}
+        if obj_type == "c":
+            params['bmatu'] = interpolators[0]
         elif obj_type == "s":
-            params['obj_type'] = "Surface"
-            params['bmatu'] = Interpolator.BEZIER if \
-                match.group("bmatu") == "bezier" else Interpolator.BSPLINE
-            params['bmatv'] = Interpolator.BEZIER if  \
-                match.group("bmatv") == "bezier" else Interpolator.BSPLINE
-        elif obj_type == "w":
-            params['obj_type'] = "Wireframe"
-            params['faces'] = self.faces_as_list(match.group("faces"))
+            params['bmatu'], params['bmatv'] = interpolators
+        elif obj_type == "w" and command.faces is not None:
+            params['faces'] = command.faces
 
         self._executor.add(**params)
 
-    def _remove(self, match):
+    def _remove(self, command: 'OmlCommand'):
         """Execute `remove`."""
-        name = match.group("name")
-        self._executor.remove(name)
+        self._executor.remove(command.name)
 
-    def _translate(self, match):
+    def _translate(self, command: 'OmlCommand'):
         """Execute `translate`."""
-        name = match.group("name")
-        dx = float(match.group("dx"))
-        dy = float(match.group("dy"))
-        dz = float(match.group("dz"))
-        self._executor.translate(name, dx, dy, dz)
+        dx, dy, dz = command.values.tolist()
+        self._executor.translate(command.name, dx, dy, dz)
 
-    def _scale(self, match):
+    def _scale(self, command: 'OmlCommand'):
         """Execute `scale`."""
-        name = match.group("name")
-        factor = float(match.group("factor"))
-        self._executor.scale(name, factor)
+        factor, = command.values.tolist()
+        self._executor.scale(command.name, factor)
 
-    def _rotate(self, match):
+    def _rotate(self, command: 'OmlCommand'):
         """Execute `rotate`."""
-        name = match.group("name")
-        x_angle = np.deg2rad(float(match.group("x_angle")))
-        y_angle = np.deg2rad(float(match.group("y_angle")))
-        z_angle = np.deg2rad(float(match.group("z_angle")))
-        self._executor.rotate(name, x_angle, y_angle, z_angle, None)
+        x_angle, y_angle, z_angle = np.deg2rad(command.values).tolist()
+        self._executor.rotate(
+            command.name, x_angle, y_angle, z_angle, None)
@@ -9,6 +9,8 @@ Classes
 import numpy as np
 
 from .paintable_object import PaintableObject
+from util.clipping import clip_polylines
+from util.tessellation import subdivide_segments, tessellate_segments
 
 
 class Interpolator:
@@ -25,19 +27,39 @@ class Interpolator:
 
 
 class Curve(PaintableObject):
-    """Curve given by control points in homogeneous coordinates."""
+    """Curve given by control points in homogeneous coordinates.
+
+    Besides its projected control points, the curve caches its tessellated
+    and clipped segments, so that redrawing it doesn't require evaluating
+    it again. They are recomputed by `update`, i.e. only when the control
+    points, the interpolator or the window change.
+
+    Segments are subdivided until they are within `TOLERANCE` pixels of
+    the curve, hence the number of samples follows the curve's size on
+    the screen. If `TOLERANCE` is None, each segment is sampled `SAMPLES`
+    times instead. Both may be set per class or per curve.
+
+    """
+
+    SAMPLES = 100
+    """Number of samples of each segment, not counting its first point."""
+
+    TOLERANCE = 0.5
+    """Flatness tolerance, in pixels, of adaptive tessellation."""
 
     def __init__(self, name: 'str', points: 'list', bmatu: 'Interpolator',
                  color: 'tuple'):
         """Construct curve."""
         super().__init__(name, points, color, 1)
         self._bmat = bmatu
+        self._cached_segments = (np.empty((0, 2, 2)),
+                                 np.empty(0, dtype=bool))
 
     def __str__(self):
         """Cohersion to string."""
         return "{}(Curve) with control points = {} and color = {}".format(
             self.name,
-            str([(p[0], p[1], p[2]) for p in self._points]),
+            str([(p[0], p[1], p[2]) for p in self.points]),
             str(self.color))
 
     @property
@@ -45,6 +67,23 @@ class Curve(PaintableObject):
         """Polynomial basis used for interpolating the curve."""
         return self._bmat
 
+    @bmatu.setter
+    def bmatu(self, bmatu: 'Interpolator'):
+        """Change the interpolator, marking the curve as stale."""
+        self._bmat = bmatu
+        self._dirty = True
+
+    @property
+    def cached_segments(self) -> 'tuple':
+        """Clipped segments of the tessellated curve.
+
+        See also
+        --------
+            `clip_polylines`
+
+        """
+        return self._cached_segments
+
     @property
     def deg(self) -> 'int':
         """Degree of interpolator."""
@@ -57,3 +96,33 @@ class Curve(PaintableObject):
     def update(self, window: 'Window'):
         """Generate visible parts of curve."""
         self._cached_points = self.projected(window)
+        geometry = self.segment_geometry(self._cached_points)
+        if self.TOLERANCE is None:
+            polylines = tessellate_segments(self._bmat, geometry, self.SAMPLES)
+            points = polylines.reshape(-1, 2)
+            offsets = np.arange(len(polylines) + 1) * (self.SAMPLES + 1)
+        else:
+            points, offsets = subdivide_segments(
+                self._bmat, geometry, self.TOLERANCE * window.pixel_size)
+        self._cached_segments = clip_polylines(points, offsets)
+
+    def segment_geometry(self, points: 'np.array') -> 'np.array':
+        """(S, 4, 2) control points of each segment of the curve.
+
+        Notes
+        -----
+            Bezier curves share their endpoints between segments: after the
+            first four control points, each pair of new points makes a
+            segment with the last two points of the previous one. Other
+            splines have one segment per four consecutive control points.
+
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 4:
+            return np.empty((0, 4, 2))
+        if self._bmat is Interpolator.BEZIER:
+            i = 2 * np.arange((len(points) - 4) // 2)
+            rest = np.stack((i + 3, i + 2, i + 4, i + 5), axis=1)
+            return points[np.concatenate(([[0, 1, 2, 3]], rest))]
+        i = np.arange(len(points) - 3)[:, np.newaxis]
+        return points[i + np.arange(4)]
@@ -14,7 +14,7 @@ class Line(PaintableObject):
         """Cohersion to string."""
         return "{}(Line) at {}, with color = {}".format(
             self.name,
-            str([(p[0], p[1], p[2]) for p in self._points]),
+            str([(p[0], p[1], p[2]) for p in self.points]),
             str(self.color))
 
     def accept(self, painter: 'ObjectPainter'):
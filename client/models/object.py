@@ -10,28 +10,41 @@ class Object:
 
     Each object is composed by:
     - Name
-    - List of points in 4D homogeneous coordinates.
+    - (N, 4) array of points in 4D homogeneous coordinates.
     - RGB color tuple.
     - Thickness used for drawing.
 
+    The points given at construction are never modified. Instead, every
+    transformation is accumulated into a 4x4 model matrix, and the
+    transformed points are only computed when `points` is accessed. The
+    center is transformed along with the model matrix, hence transforming
+    an object takes constant time.
+
     """
 
     def __init__(self, name: 'str', points: 'list', color: 'tuple',
                  thickness: 'float'):
         """Construct object."""
         self._name = name
-        self._points = points
+        self._points = np.asarray(points, dtype=np.float64).reshape(-1, 4)
         self._color = color
         self._thickness = thickness
+        self._model = np.identity(4)
+        if len(self._points) > 0:
+            self._base_center = np.average(self._points, axis=0)
+        else:
+            self._base_center = np.array([0., 0., 0., 1.])
+
+    @property
+    def base_points(self) -> 'np.array':
+        """(N, 4) array of points of object, before any transformation."""
+        return self._points
 
     @property
     def center(self) -> 'tuple':
         """Geometric center of object."""
-        x_points = [point[0] for point in self.points]
-        y_points = [point[1] for point in self.points]
-        z_points = [point[2] for point in self.points]
-        return (
-            np.average(x_points), np.average(y_points), np.average(z_points))
+        x, y, z = (self._base_center@self._model)[:3]
+        return (x, y, z)
 
     @property
     def color(self) -> 'tuple':
@@ -44,9 +57,14 @@ class Object:
         return self._name
 
     @property
-    def points(self) -> 'list':
-        """List of Points of object."""
-        return self._points
+    def model_matrix(self) -> 'np.array':
+        """Accumulated transformation of object."""
+        return self._model
+
+    @property
+    def points(self) -> 'np.array':
+        """(N, 4) array of transformed points of object."""
+        return self._points@self._model
 
     @property
     def thickness(self) -> 'float':
@@ -81,6 +99,5 @@ class Object:
         self.transform(to_origin_tr@rotate_tr@from_origin_tr)
 
     def transform(self, matrix_tr: 'np.array'):
-        """Apply `matrix_tr` to the object's coordinates."""
-        for i in range(len(self.points)):
-            self.points[i] = self.points[i]@matrix_tr
+        """Compose `matrix_tr` with the object's model matrix."""
+        self._model = self._model@matrix_tr
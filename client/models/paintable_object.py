@@ -1,9 +1,10 @@
 """Augmented interface for objects that may be painted."""
 from abc import abstractmethod
 
+import numpy as np
+
 from .object import Object
-from util.linear_algebra import (
-    translation_matrix, escalation_matrix, size, transformed)
+from util.linear_algebra import model_view_matrix, perspective_projection
 
 
 class PaintableObject(Object):
@@ -24,7 +25,14 @@ class PaintableObject(Object):
     The interface does not attempt to auto-detect changes to `cached_points`
     since they may be caused by the movement of another object, namely the
     window. Instead, the interface provides an update method, and relies on the
-    ObjectStore to maintain the objects updated.
+    ObjectStore to maintain the objects updated. To avoid needless work, the
+    object remembers whether it has been transformed and which window version
+    it was last projected for; `refresh` only calls `update` when either of
+    them changed.
+
+    The object also keeps a bounding sphere, which is cheaply updated by
+    every transformation; it allows the ObjectStore to `cull` objects that
+    lie outside of the window's view without projecting them.
 
     The interface implements the visitor pattern, which means every
     PaintableObject may be visited by an ObjectPainter that doesn't know
@@ -38,6 +46,26 @@ class PaintableObject(Object):
         """Initialize cached points."""
         super().__init__(name, points, color, thickness)
         self._cached_points = []
+        self._dirty = True
+        self._window_version = None
+        self._model_view = None
+
+        xyz = self._points[:, :3]
+        if len(xyz) > 0:
+            center = (xyz.min(axis=0) + xyz.max(axis=0)) / 2
+            self._base_bound_radius = float(
+                np.max(np.linalg.norm(xyz - center, axis=1)))
+        else:
+            center = np.zeros(3)
+            self._base_bound_radius = 0.0
+        self._base_bound_center = np.append(center, 1)
+        self._bound_center = center
+        self._bound_radius = self._base_bound_radius
+
+    @property
+    def bounding_sphere(self) -> 'tuple':
+        """Center and radius of a sphere that encloses the object."""
+        return (self._bound_center, self._bound_radius)
 
     @property
     def cached_points(self) -> 'list':
@@ -49,28 +77,77 @@ class PaintableObject(Object):
         """Accept paint request."""
         raise NotImplementedError
 
-    def projected(self, window) -> 'list':
-        """Give the object's coordinates in respect to a given window."""
-        def project(point):
-            """Perspective projection."""
-            return (
-                point[0]*COP_DISTANCE/point[2], point[1]*COP_DISTANCE/point[2])
+    def model_view(self, window: 'Window') -> 'np.array':
+        """Model matrix composed with the window's view matrix.
+
+        Notes
+        -----
+            The composition is cached until either the object or the
+            window is transformed.
+
+        """
+        if self._model_view is None or \
+                self._model_view[0] != window.version:
+            self._model_view = (window.version, model_view_matrix(
+                self.model_matrix, window.view_matrix))
+        return self._model_view[1]
 
-        # NOTE: Assumes square window
-        window_size = size((window.points[0], window.points[3]))
+    def projected(self, window) -> 'np.array':
+        """Give the object's (N, 2) coordinates in respect to a given window.
 
-        x, y, z = window.center
-        COP_DISTANCE = 1
+        The base points go through a single matrix product, with the fused
+        model-view matrix, followed by the perspective division; the
+        transformed points are never materialized.
 
-        to_origin_tr = translation_matrix(-x, -y, -z)
-        rotate_tr = window.inv_rotation_matrix
-        cop_to_origin_tr = translation_matrix(0, 0, COP_DISTANCE*window_size/2)
-        scale_tr = escalation_matrix(
-            2/window_size, 2/window_size, 2/window_size)
-        concat_tr = to_origin_tr@rotate_tr@cop_to_origin_tr@scale_tr
+        See also
+        --------
+            `perspective_projection`
+            `Window.view_matrix`
 
-        transformed_points = transformed(self.points, concat_tr)
-        return list(map(project, transformed_points))
+        """
+        return perspective_projection(
+            self.base_points, self.model_view(window), window.COP_DISTANCE)
+
+    def needs_update(self, window: 'Window') -> 'bool':
+        """Whether `cached_points` are stale for a given window."""
+        return self._dirty or self._window_version != window.version
+
+    def refresh(self, window: 'Window'):
+        """Update cached_points only if they are stale."""
+        if self.needs_update(window):
+            self.update(window)
+            self._dirty = False
+            self._window_version = window.version
+
+    def cull(self, window: 'Window'):
+        """Mark object as invisible through a given window.
+
+        Used instead of `refresh` when the object is known to be outside
+        of the window's view; its points are not projected.
+
+        """
+        self._cached_points = []
+        self._dirty = False
+        self._window_version = window.version
+
+    def transform(self, matrix_tr: 'np.array'):
+        """Apply `matrix_tr`, move the bounding sphere, and mark as stale.
+
+        Notes
+        -----
+            The sphere is derived from the one around the base points and
+            the model matrix. Its radius is scaled by the largest singular
+            value of the linear part of the model matrix, hence rotations
+            and translations don't inflate it.
+
+        """
+        super().transform(matrix_tr)
+        model = self.model_matrix
+        self._bound_center = (self._base_bound_center@model)[:3]
+        self._bound_radius = self._base_bound_radius * float(
+            np.linalg.norm(model[:3, :3], 2))
+        self._model_view = None
+        self._dirty = True
 
     @abstractmethod
     def update(self, window: 'Window'):
@@ -79,4 +156,4 @@ class PaintableObject(Object):
 
     @property
     def visible(self):
-        return self.cached_points != []
+        return len(self.cached_points) != 0
@@ -12,9 +12,10 @@ class Point(PaintableObject):
 
     def __str__(self):
         """Cohersion to string."""
+        x, y, z, _ = self.points[0]
         return "{}(Point) at {}, with color = {}".format(
             self.name,
-            str((self._points[0][0], self._points[0][1], self._points[0][2])),
+            str((x, y, z)),
             str(self.color))
 
     def accept(self, painter: 'ObjectPainter'):
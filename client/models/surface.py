@@ -1,9 +1,31 @@
 """This module provides a Surface class."""
+import numpy as np
+
 from .paintable_object import PaintableObject
+from util.clipping import clip_polylines
+from util.tessellation import (
+    bezier_basis, tessellate_patch, uniform_samples)
 
 
 class Surface(PaintableObject):
-    """Surface given by control points in homogeneous coordinates."""
+    """Surface given by control points in homogeneous coordinates.
+
+    The surface is drawn as two families of curves, the rows and columns of
+    a grid of samples. Like a Curve, it caches its tessellated and clipped
+    segments until the control points, the interpolators or the window
+    change.
+
+    Each family has `SAMPLES` + 1 curves. The curves are sampled uniformly,
+    as many times as needed for them to be within `TOLERANCE` pixels of the
+    surface; if `TOLERANCE` is None, they are sampled `SAMPLES` times.
+
+    """
+
+    SAMPLES = 20
+    """Number of curves in each family, not counting the first."""
+
+    TOLERANCE = 0.5
+    """Flatness tolerance, in pixels, of adaptive tessellation."""
 
     def __init__(self, name: 'str', points: 'list', bmatu: 'ndarray',
                  bmatv: 'ndarray', color: 'tuple'):
@@ -11,12 +33,14 @@ class Surface(PaintableObject):
         super().__init__(name, points, color, 0.5)
         self._bmatu = bmatu
         self._bmatv = bmatv
+        self._cached_segments = (np.empty((0, 2, 2)),
+                                 np.empty(0, dtype=bool))
 
     def __str__(self):
         """Cohersion to string."""
         return "{}(Surface) with control points = {} and color = {}".format(
             self.name,
-            str([(p[0], p[1], p[2]) for p in self._points]),
+            str([(p[0], p[1], p[2]) for p in self.points]),
             str(self.color))
 
     @property
@@ -24,11 +48,34 @@ class Surface(PaintableObject):
         """interpolator for the family of curves in u."""
         return self._bmatu
 
+    @bmatu.setter
+    def bmatu(self, bmatu: 'Interpolator'):
+        """Change the interpolator in u, marking the surface as stale."""
+        self._bmatu = bmatu
+        self._dirty = True
+
     @property
     def bmatv(self) -> 'Interpolator':
         """interpolator for the family of curves in v."""
         return self._bmatv
 
+    @bmatv.setter
+    def bmatv(self, bmatv: 'Interpolator'):
+        """Change the interpolator in v, marking the surface as stale."""
+        self._bmatv = bmatv
+        self._dirty = True
+
+    @property
+    def cached_segments(self) -> 'tuple':
+        """Clipped segments of the tessellated surface.
+
+        See also
+        --------
+            `clip_polylines`
+
+        """
+        return self._cached_segments
+
     @property
     def degu(self) -> 'int':
         """Degree of interpolator of family of curves in u."""
@@ -44,5 +91,29 @@ class Surface(PaintableObject):
         painter.paint_surface(self)
 
     def update(self, window: 'Window'):
-        """Generate visible parts of curve."""
+        """Generate visible parts of surface."""
         self._cached_points = self.projected(window)
+        geometry = self._cached_points.reshape(
+            self.degu + 1, self.degv + 1, 2)
+        nu = nv = self.SAMPLES
+        if self.TOLERANCE is not None:
+            # Every curve of a family is within the hull of the Bezier net
+            net = np.einsum(
+                'ai,ijc,bj->abc',
+                np.linalg.solve(bezier_basis(self.degu), self._bmatu),
+                geometry,
+                np.linalg.solve(bezier_basis(self.degv), self._bmatv))
+            tolerance = self.TOLERANCE * window.pixel_size
+            nu = uniform_samples(net.transpose(1, 0, 2), tolerance)
+            nv = uniform_samples(net, tolerance)
+
+        rows = tessellate_patch(
+            self._bmatu, self._bmatv, geometry, self.SAMPLES, nv)
+        columns = tessellate_patch(
+            self._bmatu, self._bmatv, geometry, nu, self.SAMPLES)
+        points = np.concatenate((rows.reshape(-1, 2),
+                                 columns.transpose(1, 0, 2).reshape(-1, 2)))
+        offsets = np.concatenate((
+            np.arange(self.SAMPLES + 1) * (nv + 1),
+            rows.size // 2 + np.arange(self.SAMPLES + 2) * (nu + 1)))
+        self._cached_segments = clip_polylines(points, offsets)
@@ -2,7 +2,10 @@
 import numpy as np
 
 from .paintable_object import PaintableObject
-from util.linear_algebra import (translation_matrix, rotation_matrix)
+from util.culling import frustum_planes, sphere_in_frustum
+from util.faces import FaceArray
+from util.linear_algebra import (
+    translation_matrix, escalation_matrix, rotation_matrix, size)
 
 
 class Window(PaintableObject):
@@ -11,36 +14,128 @@ class Window(PaintableObject):
     The cached points and faces are stored for compatibility
     with the PaintableObject interface; they'll never change.
 
+    The view matrix, which takes world coordinates to the window's
+    perspective, only depends on the window itself. Hence, it is rebuilt
+    exclusively when the window is transformed, and every rebuild
+    increments `version`. The same goes for the planes of the view
+    frustum, which are used for culling.
+
+    The window also knows the resolution, in pixels, of the viewport it is
+    shown on, so that objects may tessellate themselves to the precision
+    it requires. Changing the resolution increments `version` as well.
+
     """
 
+    COP_DISTANCE = 1
+
     def __init__(self):
         """Construct window."""
         points = [[0, 500, 0, 1],
                   [500, 500, 0, 1],
                   [500, 0, 0, 1],
                   [0, 0, 0, 1]]
-        map(np.array, points)
         super().__init__("window", points, (0., 0., 0.), 2)
-        self._cached_faces = [[0, 1, 2, 3]]
-        self._cached_points = [(-1, 1), (1, 1), (1, -1), (-1, -1)]
+        self._cached_faces = FaceArray.from_lists([[0, 1, 2, 3]])
+        self._cached_edges = self._cached_faces.edges()
+        self._cached_points = np.array(
+            [(-1, 1), (1, 1), (1, -1), (-1, -1)], dtype=np.float64)
         self._orientation = np.array([[1, 0, 0, 0],
                                       [0, 1, 0, 0],
                                       [0, 0, 1, 0],
                                       [0, 0, 0, 1]])
+        self._version = 0
+        self._resolution = (500, 500)
+        self._view_matrix = self._build_view_matrix()
+        self._frustum_planes = frustum_planes(self._view_matrix)
 
     def __str__(self):
         """Cohersion to string."""
         return "Window with boundaries at {}".format(self.points)
 
     @property
-    def cached_faces(self) -> 'list':
+    def cached_faces(self) -> 'FaceArray':
         """Faces."""
         return self._cached_faces
 
+    @property
+    def cached_edges(self) -> 'np.array':
+        """Edges."""
+        return self._cached_edges
+
     @property
     def inv_rotation_matrix(self) -> 'np.array':
-        """Linear transformation that reverses orientation."""
-        return np.linalg.inv(self._orientation)
+        """Linear transformation that reverses orientation.
+
+        Notes
+        -----
+            The orientation is orthonormal, thus its inverse is its
+            transpose.
+
+        """
+        return self._orientation.T
+
+    @property
+    def version(self) -> 'int':
+        """Number of times the window has been transformed."""
+        return self._version
+
+    @property
+    def resolution(self) -> 'tuple':
+        """Width and height of the viewport, in pixels."""
+        return self._resolution
+
+    @resolution.setter
+    def resolution(self, resolution: 'tuple'):
+        """Change the viewport's resolution."""
+        resolution = tuple(resolution)
+        if resolution != self._resolution:
+            self._resolution = resolution
+            self._version += 1
+
+    @property
+    def pixel_size(self) -> 'float':
+        """Length of a pixel in normalized window coordinates.
+
+        Notes
+        -----
+            The normalized window spans 2 units in each direction; the
+            smallest pixel dimension is given.
+
+        """
+        return 2 / max(self._resolution)
+
+    @property
+    def view_matrix(self) -> 'np.array':
+        """Cached transformation from world to window coordinates."""
+        return self._view_matrix
+
+    @property
+    def frustum_planes(self) -> 'np.array':
+        """Cached planes of the view frustum in world coordinates."""
+        return self._frustum_planes
+
+    def sees(self, obj: 'PaintableObject') -> 'bool':
+        """Whether `obj`'s bounding sphere intersects the view frustum."""
+        return sphere_in_frustum(*obj.bounding_sphere, self._frustum_planes)
+
+    def _build_view_matrix(self) -> 'np.array':
+        """Concatenate world to window transformations.
+
+        Notes
+        -----
+            Assumes square window.
+
+        """
+        window_size = size((self.points[0], self.points[3]))
+        x, y, z = self.center
+
+        to_origin_tr = translation_matrix(-x, -y, -z)
+        rotate_tr = self.inv_rotation_matrix
+        cop_to_origin_tr = translation_matrix(
+            0, 0, Window.COP_DISTANCE*window_size/2)
+        scale_tr = escalation_matrix(
+            2/window_size, 2/window_size, 2/window_size)
+        return to_origin_tr@rotate_tr@cop_to_origin_tr@scale_tr
 
     def accept(self, painter: 'ObjectPainter'):
         """Accept paint request."""
@@ -61,5 +156,12 @@ class Window(PaintableObject):
         rotate_tr = rotation_matrix(x_angle, y_angle, z_angle)
         from_origin_tr = translation_matrix(x, y, z)
 
-        self.transform(to_origin_tr@rotate_tr@from_origin_tr)
         self._orientation = self._orientation@rotate_tr
+        self.transform(to_origin_tr@rotate_tr@from_origin_tr)
+
+    def transform(self, matrix_tr: 'np.array'):
+        """Apply `matrix_tr` to the window and rebuild its view matrix."""
+        super().transform(matrix_tr)
+        self._view_matrix = self._build_view_matrix()
+        self._frustum_planes = frustum_planes(self._view_matrix)
+        self._version += 1
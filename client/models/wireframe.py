@@ -1,17 +1,50 @@
 """This module provides a wireframe class."""
+import numpy as np
+
 from .paintable_object import PaintableObject
 from util.clipping import clip_wireframe
+from util.decimation import cluster_vertices
+from util.faces import FaceArray
+from util.linear_algebra import NEAR_PLANE, perspective_projection
 
 
 class Wireframe(PaintableObject):
-    """Wireframe model using face-vertex meshes."""
+    """Wireframe model using face-vertex meshes.
+
+    Faces may be given either as a FaceArray or as one list of indices per
+    face, in which case they are converted to a FaceArray.
+
+    The unique edges of the cached faces are computed on demand and kept
+    until the cached faces change, so that edges shared by adjacent faces
+    are only painted once.
+
+    Dense meshes are drawn at a level of detail that matches their size on
+    the screen: levels are simplified by vertex clustering on grids of
+    `LOD_GRIDS` cells, and the coarsest level whose cells still span at
+    most `LOD_PIXELS` pixels is projected. Each level is built the first
+    time it is needed and kept thereafter.
+
+    """
+
+    LOD_MIN_FACES = 500
+    """Meshes with fewer faces are always drawn in full detail."""
+
+    LOD_GRIDS = (16, 32, 64, 128, 256)
+    """Cells along the longest side of the mesh for each level of detail."""
 
-    def __init__(self, name: 'str', points: 'list', faces: 'list',
+    LOD_PIXELS = 2
+    """Largest size, in pixels, of the cells of the level drawn."""
+
+    def __init__(self, name: 'str', points: 'list', faces: 'FaceArray',
                  color: 'tuple'):
         """Construct wireframe."""
         super().__init__(name, points, color, 0.1)
+        if not isinstance(faces, FaceArray):
+            faces = FaceArray.from_lists(faces)
         self._faces = faces
-        self._cached_faces = []
+        self._cached_faces = FaceArray.from_lists([])
+        self._cached_edges = None
+        self._levels = {}
 
     def __str__(self):
         """Cohersion to string."""
@@ -20,23 +53,59 @@ class Wireframe(PaintableObject):
             str(self.color))
 
     @property
-    def cached_faces(self) -> 'list':
+    def cached_faces(self) -> 'FaceArray':
         """The Faces of clipped polygon mesh."""
         return self._cached_faces
 
     @property
-    def faces(self) -> 'list':
+    def cached_edges(self) -> 'np.array':
+        """(E, 2) array with the unique edges of `cached_faces`."""
+        if self._cached_edges is None:
+            self._cached_edges = self._cached_faces.edges()
+        return self._cached_edges
+
+    @property
+    def faces(self) -> 'FaceArray':
         """Connected faces."""
         return self._faces
 
+    def level_of_detail(self, window: 'Window') -> 'tuple':
+        """Base points and faces of the mesh to be drawn through `window`.
+
+        Notes
+        -----
+            The mesh's size on the screen is estimated from its bounding
+            sphere, as seen from the window at the sphere's nearest depth.
+
+        """
+        full = (self.base_points, self._faces)
+        if len(self._faces) < self.LOD_MIN_FACES:
+            return full
+        center, radius = self.bounding_sphere
+        view = window.view_matrix
+        depth = (np.append(center, 1)@view)[2]
+        radius *= float(np.linalg.norm(view[:3, :3], 2))
+        if depth - radius <= NEAR_PLANE:
+            return full
+        diameter = 2 * window.COP_DISTANCE * radius / (depth - radius)
+        cells = diameter / window.pixel_size / self.LOD_PIXELS
+        for grid in self.LOD_GRIDS:
+            if grid >= cells:
+                if grid not in self._levels:
+                    self._levels[grid] = cluster_vertices(
+                        self.base_points, self._faces, grid)
+                return self._levels[grid]
+        return full
+
     def accept(self, painter: 'ObjectPainter'):
         """Accept paint request."""
         painter.paint_polymesh(self)
 
     def update(self, window: 'Window'):
         """Update cached coordinates."""
-        # TEMP: Clipping is disabled due to performance issues
-        # self._cached_points, self.cached_faces = clip_wireframe(
-        #     self.projected(window), self.faces)
-        self._cached_points = self.projected(window)
-        self._cached_faces = self._faces
+        points, faces = self.level_of_detail(window)
+        self._cached_points, faces = clip_wireframe(perspective_projection(
+            points, self.model_view(window), window.COP_DISTANCE), faces)
+        if faces is not self._cached_faces:
+            self._cached_faces = faces
+            self._cached_edges = None
@@ -1,4 +1,4 @@
-"""Module responsible for storing objects.
+"""Module responsible for storing objects in a Gtk model.
 
 Classes
 -------
@@ -11,8 +11,7 @@ from enum import Enum
 from gi.repository import GObject
 from gi.repository import Gtk
 
-from util import (Logger, LogLevel)
-from .models import Window
+from .scene import Scene
 
 
 class Column(Enum):
@@ -23,24 +22,19 @@ class Column(Enum):
     TYPE = 2
 
 
-class ObjectStore(Gtk.ListStore):
-    """Container for storing PaintableObjects.
+class ObjectStore(Scene, Gtk.ListStore):
+    """Scene that provides a graphical representation of stored objects.
 
-    Implemented using Gtk.ListStore; provides a graphical representation of
-    stored objects.
-
-    Operations:
-    - add
-    - get
-    - set
-    - remove
-
-    The ObjectStore also provides a list of visible objects through it's
-    `display_file` property.
+    Every stored object is mirrored as a row of a Gtk.ListStore. Each name
+    is mapped to a Gtk.TreeRowReference of its row, so that removing an
+    object doesn't depend on the number of stored objects.
 
+    Within a `batch`, objects are stored right away but their rows are only
+    appended to the ListStore once the batch ends.
 
     See Also
     --------
+        `Scene`
         `ObjectView`
 
     """
@@ -51,10 +45,6 @@ class ObjectStore(Gtk.ListStore):
         Specify ListStore with 3 columns: one for storing the object, another
         for storing its name, and a third for storing its type.
 
-        Notes
-        -----
-            The ObjectStore is initialized with 1 object, the window.
-
         See also
         --------
             `Column`
@@ -64,76 +54,32 @@ class ObjectStore(Gtk.ListStore):
                                GObject.TYPE_PYOBJECT,
                                GObject.TYPE_STRING,
                                GObject.TYPE_STRING)
-        self.window = Window()
-        self["window"] = self.window
-
-    def __getitem__(self, name: 'str') -> 'Object':
-        """Retrieve object from its name.
-
-        Raises
-        ------
-            KeyError
-                The named object does not exist.
-
-        """
-        for row in self:
-            if row[Column.NAME.value] == name:
-                return row[Column.OBJ.value]
-        raise KeyError(name + " does not name an object!")
-
-    def __setitem__(self, name: 'str', obj: 'Object'):
-        """Add object.
-
-        Raises
-        ------
-            KeyError
-                The name is already in use.
-
-        """
-        if name in [row[Column.NAME.value] for row in self]:
-            raise KeyError(name + " already names an object!")
-        self.append([obj, obj.name, str(type(obj).__name__)])
-        obj.update(self.window)
-        Logger.log(LogLevel.INFO, str(obj))
-
-    def __delitem__(self, name: 'str'):
-        """Delete object.
-
-        Raises
-        ------
-            KeyError
-                The named object does not exist.
-
-        """
-        for row in self:
-            if row[Column.NAME.value] == name:
-                if self.window.name == name:
-                    raise KeyError("cannot remove window!")
-                else:
-                    self.remove(row.iter)
-                    Logger.log(LogLevel.INFO, name + " has been removed!")
-                    return
-        raise KeyError(name + " does not name an object!")
-
-    def changed(self, obj: 'Object'):
-        """Notify that the visibility of an object has changed.
-
-        If the window is moved, all objects are updated.
-
-        See also
-        --------
-            `Executor`
-
-        """
-        if obj.name == self.window.name:
-            for row in self:
-                o = row[Column.OBJ.value]
-                o.update(self.window)
+        self._row_refs = {}
+        self._pending_rows = {}
+        Scene.__init__(self)
+
+    def _object_added(self, name: 'str', obj: 'Object'):
+        """Append the row of `obj`, unless a batch is in progress."""
+        if self.in_batch:
+            self._pending_rows[name] = obj
         else:
-            obj.update(self.window)
+            self._row_refs[name] = self._append_row(obj)
 
-    @property
-    def display_file(self) -> 'list':
-        """Visible objects."""
-        return [row[Column.OBJ.value] for row in self
-                if row[Column.OBJ.value].visible]
+    def _object_removed(self, name: 'str'):
+        """Remove the row of object `name`."""
+        if name in self._pending_rows:
+            del self._pending_rows[name]
+        else:
+            row_ref = self._row_refs.pop(name)
+            self.remove(self.get_iter(row_ref.get_path()))
+
+    def _batch_committed(self):
+        """Append the rows of objects added during a batch."""
+        for name, obj in self._pending_rows.items():
+            self._row_refs[name] = self._append_row(obj)
+        self._pending_rows = {}
+
+    def _append_row(self, obj: 'Object') -> 'Gtk.TreeRowReference':
+        """Append row for `obj` to the ListStore."""
+        tree_iter = self.append([obj, obj.name, str(type(obj).__name__)])
+        return Gtk.TreeRowReference.new(self, self.get_path(tree_iter))
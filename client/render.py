@@ -0,0 +1,155 @@
+"""This module renders .obj and .oml files offscreen, without Gtk.
+
+The scene is loaded through the same Executor and Interpreter used by the
+GTK client, and painted by an ObjectPainter onto a cairo ImageSurface
+(PNG) or SVGSurface (SVG), as chosen by the extension of the output file.
+
+Usage:
+    zrender [--size WxH] [--fit] [--verbose] INPUT... OUTPUT
+
+Functions
+---------
+    load
+    fit
+    render
+    main
+
+"""
+import argparse
+import os
+
+import cairo
+
+from util import DotObjParser, DotOmlParser, Logger, LogLevel
+from .executor import Executor
+from .interpreter import Interpreter
+from .object_painter import ObjectPainter
+from .scene import Scene
+
+
+FORMATS = (".png", ".svg")
+"""Supported output formats."""
+
+WHITE = (1, 1, 1)
+
+
+def load(scene: 'Scene', paths: 'list'):
+    """Add the objects described by .obj and .oml files to `scene`.
+
+    Raises
+    ------
+        ValueError
+            A file is neither a .obj nor a .oml file.
+
+    """
+    executor = Executor(scene)
+    dot_obj_parser = DotObjParser(executor)
+    dot_oml_parser = DotOmlParser(Interpreter(executor))
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".obj":
+            dot_obj_parser.compile_obj_file(path)
+        elif extension == ".oml":
+            dot_oml_parser.interpret_oml_file(path)
+        else:
+            raise ValueError(path + " is neither a .obj nor a .oml file!")
+
+
+def fit(scene: 'Scene', margin: 'float' = 1.1):
+    """Move the window so that every object of `scene` is in view.
+
+    Notes
+    -----
+        The window is centered in front of the scene's bounding sphere,
+        touching it, and scaled to `margin` times the sphere's diameter.
+        The window is assumed not to have been rotated.
+
+    """
+    sphere = scene.bounding_sphere()
+    if sphere is None:
+        return
+    (x, y, z), radius = sphere
+    window = scene.window
+    executor = Executor(scene)
+    cx, cy, cz = window.center
+    executor.translate(window.name, x - cx, y - cy, z - radius - cz)
+    size = window.points[1][0] - window.points[0][0]
+    executor.scale(window.name, 2 * margin * radius / size)
+
+
+def render(scene: 'Scene', path: 'str', resolution: 'tuple' = (500, 500)):
+    """Paint the visible objects of `scene` into a .png or .svg file.
+
+    Raises
+    ------
+        ValueError
+            `path` has an unsupported extension.
+
+    See also
+    --------
+        `FORMATS`
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError("unsupported output format: " + path)
+    width, height = resolution
+    if extension == ".svg":
+        surface = cairo.SVGSurface(path, width, height)
+    else:
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    cr = cairo.Context(surface)
+    cr.set_source_rgb(*WHITE)
+    cr.paint()
+    # ObjectPainter leaves room for the viewport's 10 pixel clip region.
+    cr.translate(-10, -10)
+
+    scene.window.resolution = resolution
+    objects = [obj for obj in scene.display_file if obj is not scene.window]
+    ObjectPainter(cr, resolution).paint_objects(objects)
+    if extension == ".png":
+        surface.write_to_png(path)
+    surface.finish()
+
+
+def _resolution(string: 'str') -> 'tuple':
+    """Parse a WxH resolution."""
+    try:
+        width, height = (int(n) for n in string.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected WxH, got " + repr(string)) from None
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("resolution must be positive")
+    return (width, height)
+
+
+def main(argv: 'list' = None) -> 'int':
+    """Command line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="zrender",
+        description="Render .obj and .oml files to a PNG or SVG image.")
+    parser.add_argument("inputs", metavar="INPUT", nargs="+",
+                        help=".obj or .oml files, loaded in order")
+    parser.add_argument("output", metavar="OUTPUT",
+                        help=".png or .svg file to write")
+    parser.add_argument("--size", type=_resolution, default=(500, 500),
+                        metavar="WxH", help="resolution (default: 500x500)")
+    parser.add_argument("--fit", action="store_true",
+                        help="move the window so that every object is seen")
+    parser.add_argument("--verbose", action="store_true",
+                        help="log every event, not only warnings and errors")
+    args = parser.parse_args(argv)
+    Logger.set_level(LogLevel.INFO if args.verbose else LogLevel.WARN)
+    if os.path.splitext(args.output)[1].lower() not in FORMATS:
+        parser.error("OUTPUT must be one of: " + ", ".join(FORMATS))
+
+    scene = Scene()
+    try:
+        load(scene, args.inputs)
+        if args.fit:
+            fit(scene)
+        render(scene, args.output, args.size)
+    except (OSError, ValueError) as error:
+        parser.exit(1, "zrender: error: {}\n".format(error))
+    return 0
@@ -0,0 +1,283 @@
+"""Module responsible for storing objects, without any GUI dependency.
+
+Classes
+-------
+    Scene
+
+"""
+from contextlib import contextmanager
+
+import numpy as np
+
+from util import (Logger, LogLevel)
+from util.culling import frustum_planes
+from util.spatial import BoundingVolumeHierarchy
+from .models import Window
+
+
+class Scene:
+    """Container for storing PaintableObjects.
+
+    Operations:
+    - add
+    - get
+    - set
+    - remove
+
+    The Scene also provides a list of visible objects through it's
+    `display_file` property. Objects are only reprojected there, and only
+    if they were transformed or the window moved since their last
+    projection. Objects whose bounding sphere lies outside of the window's
+    view are culled without being projected.
+
+    Every modification increments `generation`, so that observers can tell
+    whether anything changed at all.
+
+    The bounding boxes of all objects but the window are kept in a
+    BoundingVolumeHierarchy, which answers culling (`display_file`) and
+    picking (`objects_at`) queries without visiting every object.
+
+    Within a `batch`, additions and removals are only logged, as a single
+    summary, once the batch ends.
+
+    Notes
+    -----
+        Subclasses may mirror the stored objects elsewhere (e.g. in a GUI
+        model) by overriding `_object_added`, `_object_removed` and
+        `_batch_committed`.
+
+    See Also
+    --------
+        `ObjectStore`
+
+    """
+
+    def __init__(self):
+        """Construct Scene.
+
+        Notes
+        -----
+            The Scene is initialized with 1 object, the window.
+
+        """
+        self._generation = 0
+        self._objects = {}
+        self._order = {}
+        self._bvh = BoundingVolumeHierarchy()
+        self._batch_depth = 0
+        self._batch_log = [0, 0]  # Objects added and removed in batch
+        self.window = Window()
+        self["window"] = self.window
+
+    def __contains__(self, name: 'str') -> 'bool':
+        """Whether `name` names an object."""
+        return name in self._objects
+
+    def __len__(self):
+        """Number of objects, including the window."""
+        return len(self._objects)
+
+    def __getitem__(self, name: 'str') -> 'Object':
+        """Retrieve object from its name.
+
+        Raises
+        ------
+            KeyError
+                The named object does not exist.
+
+        """
+        try:
+            return self._objects[name]
+        except KeyError:
+            raise KeyError(name + " does not name an object!") from None
+
+    def __setitem__(self, name: 'str', obj: 'Object'):
+        """Add object.
+
+        Raises
+        ------
+            KeyError
+                The name is already in use.
+
+        """
+        if name in self._objects:
+            raise KeyError(name + " already names an object!")
+        self._objects[name] = obj
+        self._order[name] = self._generation
+        if obj is not self.window:
+            self._bvh.insert(name, *Scene._bounds(obj))
+        self._generation += 1
+        self._object_added(name, obj)
+        if self._batch_depth > 0:
+            self._batch_log[0] += 1
+        else:
+            Logger.log(LogLevel.INFO, str(obj))
+
+    def __delitem__(self, name: 'str'):
+        """Delete object.
+
+        Raises
+        ------
+            KeyError
+                The named object does not exist.
+
+        """
+        if name not in self._objects:
+            raise KeyError(name + " does not name an object!")
+        if self.window.name == name:
+            raise KeyError("cannot remove window!")
+        del self._objects[name]
+        del self._order[name]
+        self._bvh.remove(name)
+        self._generation += 1
+        self._object_removed(name)
+        if self._batch_depth > 0:
+            self._batch_log[1] += 1
+        else:
+            Logger.log(LogLevel.INFO, name + " has been removed!")
+
+    @contextmanager
+    def batch(self):
+        """Defer logging of additions and removals.
+
+        Notes
+        -----
+            Batches may be nested; a single summary is logged when the
+            outermost batch ends.
+
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._batch_committed()
+                added, removed = self._batch_log
+                self._batch_log = [0, 0]
+                if added or removed:
+                    Logger.log(LogLevel.INFO,
+                               "{} objects added, {} removed".format(
+                                   added, removed))
+
+    @property
+    def objects(self) -> 'list':
+        """All objects, including the window, in insertion order."""
+        return list(self._objects.values())
+
+    def order(self, name: 'str') -> 'int':
+        """Rank of object `name` in insertion order; later is greater.
+
+        Raises
+        ------
+            KeyError
+                The named object does not exist.
+
+        """
+        try:
+            return self._order[name]
+        except KeyError:
+            raise KeyError(name + " does not name an object!") from None
+
+    @property
+    def in_batch(self) -> 'bool':
+        """Whether a batch is in progress."""
+        return self._batch_depth > 0
+
+    def changed(self, obj: 'Object'):
+        """Notify that an object has been transformed.
+
+        Projection is deferred to `display_file`; transforming an object
+        (or the window) is enough to mark the affected objects as stale.
+        Only the object's bounding box is updated here.
+
+        See also
+        --------
+            `Executor`
+            `PaintableObject.refresh`
+
+        """
+        if obj is not self.window:
+            self._bvh.update(obj.name, *Scene._bounds(obj))
+        self._generation += 1
+
+    @property
+    def generation(self) -> 'int':
+        """Number of modifications made to the scene."""
+        return self._generation
+
+    @property
+    def display_file(self) -> 'list':
+        """Visible objects, reprojected if stale.
+
+        Notes
+        -----
+            Only the objects whose bounding boxes intersect the view
+            frustum are visited; they are returned in insertion order.
+
+        """
+        names = self._bvh.query(self.window.frustum_planes)
+        names.sort(key=self._order.__getitem__)
+        visible = [self.window]
+        for name in names:
+            obj = self._objects[name]
+            if obj.needs_update(self.window):
+                if self.window.sees(obj):
+                    obj.refresh(self.window)
+                else:
+                    obj.cull(self.window)
+            if obj.visible:
+                visible.append(obj)
+        return visible
+
+    def objects_at(self, x: 'float', y: 'float',
+                   tolerance: 'float' = 0.02) -> 'list':
+        """Names of objects that may be seen around a point of the window.
+
+        (`x`, `y`) is given in normalized window coordinates, i.e. within
+        [-1, 1]; objects whose bounding boxes intersect the view through
+        the square of side 2*`tolerance` around it are returned.
+
+        """
+        planes = frustum_planes(
+            self.window.view_matrix, x - tolerance, x + tolerance,
+            y - tolerance, y + tolerance)
+        names = self._bvh.query(planes)
+        names.sort(key=self._order.__getitem__)
+        return names
+
+    def bounding_sphere(self) -> 'tuple':
+        """Center and radius of a sphere around all objects but the window.
+
+        Returns
+        -------
+            tuple : (center, radius), or None if there are no objects.
+
+        """
+        spheres = [obj.bounding_sphere for obj in self._objects.values()
+                   if obj is not self.window]
+        if not spheres:
+            return None
+        centers = np.array([center for center, _ in spheres])
+        radii = np.array([radius for _, radius in spheres])
+        lo = np.min(centers - radii[:, np.newaxis], axis=0)
+        hi = np.max(centers + radii[:, np.newaxis], axis=0)
+        center = (lo + hi) / 2
+        radius = float(np.max(
+            np.linalg.norm(centers - center, axis=1) + radii))
+        return (center, radius)
+
+    def _object_added(self, name: 'str', obj: 'Object'):
+        """Hook called after `obj` is added."""
+
+    def _object_removed(self, name: 'str'):
+        """Hook called after the object `name` is removed."""
+
+    def _batch_committed(self):
+        """Hook called when the outermost batch ends."""
+
+    @staticmethod
+    def _bounds(obj: 'PaintableObject') -> 'tuple':
+        """Axis-aligned box around the bounding sphere of `obj`."""
+        center, radius = obj.bounding_sphere
+        return (center - radius, center + radius)
@@ -0,0 +1,38 @@
+"""Tests for util.decimation."""
+import numpy as np
+
+from util.decimation import cluster_vertices
+from util.faces import FaceArray
+
+
+def _ring(n: 'int') -> 'np.array':
+    """(n, 4) points evenly spaced on a circle."""
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    points = np.ones((n, 4))
+    points[:, 0] = 100 * np.cos(angles)
+    points[:, 1] = 100 * np.sin(angles)
+    points[:, 2] = 0
+    return points
+
+
+def test_edge_only_mesh_survives_clustering():
+    """Two-vertex faces are kept unless both vertices merge."""
+    points = _ring(1000)
+    faces = FaceArray.from_lists([[i, (i + 1) % 1000] for i in range(1000)])
+    for grid in (16, 64, 256):
+        merged, clustered = cluster_vertices(points, faces, grid)
+        assert len(clustered) > 0
+        assert (clustered.offsets[1:] - clustered.offsets[:-1] == 2).all()
+        begin = clustered.indices[0::2]
+        end = clustered.indices[1::2]
+        assert (begin != end).all()
+        assert end.max() < len(merged)
+
+
+def test_collapsed_polygons_are_dropped():
+    """Polygons left with fewer than three vertices are dropped."""
+    points = _ring(1000)
+    faces = FaceArray.from_lists([[0, 1, 2], [0, 500, 250]])
+    _, clustered = cluster_vertices(points, faces, 16)
+    assert len(clustered) == 1
+    assert len(set(clustered[0].tolist())) == 3
@@ -0,0 +1,60 @@
+"""Tests for perspective projection of points behind the viewer."""
+import numpy as np
+
+from util.clipping import clip_line, clip_point, clip_segments, \
+    clip_wireframe
+from util.faces import FaceArray
+from util.linear_algebra import perspective_projection
+from util.tessellation import subdivide_segments, uniform_samples
+
+
+BEZIER = np.array([[-1, 3, -3, 1],
+                   [3, -6, 3, 0],
+                   [-3, 3, 0, 0],
+                   [1, 0, 0, 0]], dtype=np.float64)
+
+
+def test_point_behind_cop_near_axis_is_not_projected():
+    """Points at or behind the center of projection are NaN."""
+    points = np.array([[1e-4, 2e-4, -5, 1], [0, 0, 0, 1], [0.5, 0.5, 2, 1]])
+    projected = perspective_projection(points, np.eye(4))
+    assert np.isnan(projected[:2]).all()
+    assert np.allclose(projected[2], (0.25, 0.25))
+
+
+def test_point_behind_cop_is_clipped():
+    """A point behind the viewer isn't drawn, even close to the axis."""
+    projected = perspective_projection(
+        np.array([[1e-4, 2e-4, -5, 1]]), np.eye(4))
+    assert clip_point(projected) == []
+
+
+def test_segments_through_cop_are_rejected():
+    """Segments with an endpoint behind the viewer are rejected."""
+    projected = perspective_projection(
+        np.array([[0.1, 0.1, 1, 1], [1e-4, 2e-4, -5, 1]]), np.eye(4))
+    _, visible = clip_segments(projected[np.newaxis])
+    assert not visible.any()
+    assert clip_line(projected) == []
+
+
+def test_faces_through_cop_are_rejected():
+    """Faces with a vertex behind the viewer are discarded."""
+    projected = perspective_projection(np.array([
+        [0.1, 0.1, 1, 1], [0.2, 0.1, 1, 1], [0.1, 0.2, 1, 1],
+        [1e-4, 2e-4, -5, 1]]), np.eye(4))
+    faces = FaceArray.from_lists([[0, 1, 2], [0, 1, 3]])
+    _, clipped = clip_wireframe(projected, faces)
+    assert clipped.tolist() == [[0, 1, 2]]
+
+
+def test_curves_through_cop_are_rejected():
+    """Curve segments with unprojected control points aren't sampled."""
+    projected = perspective_projection(np.array([
+        [0, 0, 1, 1], [0.1, 0.2, 1, 1], [0.2, 0.2, 1, 1],
+        [1e-4, 2e-4, -5, 1]]), np.eye(4))
+    geometry = projected[np.newaxis]
+    _, offsets = subdivide_segments(BEZIER, geometry, 1e-3)
+    assert offsets.tolist() == [0, 2]
+    assert isinstance(uniform_samples(geometry, 1e-3), int)
+    assert uniform_samples(np.full((1, 4, 2), np.nan), 1e-3) == 1
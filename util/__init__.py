@@ -1,5 +1,6 @@
 """This Package contains utilities."""
 from .clipping import (clip_point, clip_line, clip_wireframe)
+from .faces import FaceArray
 from .obj_files import DotObjParser
 from .oml_files import DotOmlParser
 from .log import Logger, LogLevel
@@ -2,97 +2,184 @@
 
 Implemented algorithms:
 - Point clipping
-- Line clipping (Cohen-Sutherland)
+- Line clipping (Cohen-Sutherland and Liang-Barsky over arrays of lines)
+- Polyline clipping (line clipping of every segment of every polyline)
 - Polygon clipping (Sutherland-Hodgeman_
-- Wireframe clipping
+- Wireframe clipping (trivial accept/reject of whole faces, then
+  Sutherland-Hodgeman for faces crossing the border)
 
 Notes
 -----
     All algorithms are based on a normalized coordinate system where
     the borders of the window are at [(-1,1), (1,1), (1,-1), (-1,-1)].
 
-    Curves are clipped whilst been drawn for optimization purposes.
+    Points that could not be projected, because they lie at or behind the
+    center of projection, are NaN (see `perspective_projection`). They are
+    given the NEAR region code, and every segment or face that involves
+    one of them is rejected.
+
+    Curves are tessellated into polylines and clipped segment by segment
+    with `clip_segments` before being drawn.
 
 """
+import numpy as np
+
+from .faces import FaceArray
+
+
+# Cohen-Sutherland region code bits
+LEFT = 1
+RIGHT = 2
+BOTTOM = 4
+TOP = 8
+NEAR = 16
 
 
 def clip_point(points: 'list') -> 'tuple':
     """Point clipping algorithm."""
     x, y = points[0]
-    if x > 1 or x < -1 or y > 1 or y < -1:
-        return []
-    else:
+    if -1 <= x <= 1 and -1 <= y <= 1:  # False for NaN coordinates
         return points
+    else:
+        return []
+
+
+def region_codes(points: 'np.array') -> 'np.array':
+    """Cohen-Sutherland region codes of an (..., 2) array of points.
+
+    Notes
+    -----
+        Bits 1, 2, 4 and 8 are set for points to the left, right, bottom
+        and top of the window, respectively; inside points have code 0.
+        Bit 16 (NEAR) is set for NaN points, which were not projected.
+
+    """
+    points = np.asarray(points, dtype=np.float64)
+    x = points[..., 0]
+    y = points[..., 1]
+    return ((x < -1) * LEFT | (x > 1) * RIGHT |
+            (y < -1) * BOTTOM | (y > 1) * TOP |
+            (np.isnan(x) | np.isnan(y)) * NEAR).astype(np.uint8)
+
+
+def clip_segments(segments: 'np.array') -> 'tuple':
+    """Clip an (M, 2, 2) array of segments against the window.
+
+    Segments are first trivially accepted or rejected by their
+    Cohen-Sutherland region codes; the remaining ones are clipped by the
+    Liang-Barsky algorithm. Everything is computed over whole arrays.
+
+    Returns
+    -------
+        tuple : (clipped, visible), where clipped is an (M, 2, 2) array
+        holding the visible part of each segment, in the segment's
+        original direction, and visible is a boolean (M,) mask. Rows of
+        invisible segments are left unchanged.
+
+    Notes
+    -----
+        Vertical and horizontal segments need no special handling:
+        Liang-Barsky only divides by a direction component when it is not
+        zero.
+
+    """
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+    codes = region_codes(segments)
+    union = codes[:, 0] | codes[:, 1]
+    inside = union == 0
+    visible = ((codes[:, 0] & codes[:, 1]) == 0) & ((union & NEAR) == 0)
+    clipped = segments.copy()
+
+    partial = np.flatnonzero(visible & ~inside)
+    if len(partial) == 0:
+        return (clipped, visible)
+
+    start = segments[partial, 0]
+    direction = segments[partial, 1] - start
+    # p*t <= q for the left, right, bottom and top borders
+    p = np.concatenate((-direction, direction), axis=1)
+    q = np.concatenate((start + 1, 1 - start), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = q / p
+    t_enter = np.max(np.where(p < 0, ratio, 0), axis=1)
+    t_exit = np.min(np.where(p > 0, ratio, 1), axis=1)
+    parallel_outside = np.any((p == 0) & (q < 0), axis=1)
+    visible[partial] = (t_enter <= t_exit) & ~parallel_outside
+
+    # Endpoints that are not moved keep their exact coordinates
+    moved_start = t_enter > 0
+    moved_end = t_exit < 1
+    clipped[partial[moved_start], 0] = (
+        start + t_enter[:, np.newaxis] * direction)[moved_start]
+    clipped[partial[moved_end], 1] = (
+        start + t_exit[:, np.newaxis] * direction)[moved_end]
+    return (clipped, visible)
 
 
 def clip_line(points: 'list') -> 'list':
-    """Cohen-Sutherland line clipping algorithm."""
-    def region_code(x, y):
-        code = 0
-        if x < -1:
-            code += 1
-        elif x > 1:
-            code += 2
-        if y < -1:
-            code += 4
-        elif y > 1:
-            code += 8
-        return code
-
-    def left_intersect(x, y):
-        return (-1, m * (-1 - x) + y)
-
-    def up_intersect(x, y):
-        return (x + 1/m * (1 - y), 1)
-
-    def right_intersect(x, y):
-        return (1, m * (1 - x) + y)
-
-    def down_intersect(x, y):
-        return (x + 1/m * (-1 - y), -1)
-
-    def intersections(x, y, code):
-        rc2int = {
-            1: [left_intersect],
-            2: [right_intersect],
-            4: [down_intersect],
-            5: [left_intersect, down_intersect],
-            6: [right_intersect, down_intersect],
-            8: [up_intersect],
-            9: [left_intersect, up_intersect],
-            10: [right_intersect, up_intersect],
-        }
-        return [i(x, y) for i in rc2int[code]]
-
-    def valid_intersection(intersections):
-        for i in intersections:
-            if i[0] <= 1 and i[0] >= -1 and i[1] <= 1 and i[1] >= -1:
-                return (i[0], i[1])
-        return []
+    """Clip a single line.
+
+    Returns
+    -------
+        list : The original points if the line is completely inside the
+        window, [] if it is completely outside, and the clipped points
+        otherwise. When exactly one point is outside the window, the new
+        point at the window border comes first.
 
-    x1, y1 = points[0]
-    x2, y2 = points[1]
-    rc1 = region_code(x1, y1)
-    rc2 = region_code(x2, y2)
-    if rc1 == 0 and rc2 == 0:  # completely inside
+    See also
+    --------
+        `clip_segments`
+
+    """
+    codes = region_codes(points)
+    if not codes.any():  # completely inside
         return points
-    elif (rc1 & rc2) != 0:  # completely outside
+    clipped, visible = clip_segments(points)
+    if not visible[0]:
         return []
-    else:  # partially inside
-        m = (y2-y1) / (x2-x1)
-        if rc1 == 0 or rc2 == 0:  # one intersection
-            if rc1 != 0:
-                i = valid_intersection(intersections(x1, y1, rc1))
-                return [i, (x2, y2)]
-            else:
-                i = valid_intersection(intersections(x2, y2, rc2))
-                return [i, (x1, y1)]
-        else:  # possibly two intersections
-            i1 = valid_intersection(intersections(x1, y1, rc1))
-            i2 = valid_intersection(intersections(x2, y2, rc2))
-            if i1 == [] or i2 == []:  # outside
-                return []
-            return [i1, i2]
+    p1, p2 = map(tuple, clipped[0].tolist())
+    if codes[0] == 0:  # Intersection comes first
+        return [p2, p1]
+    return [p1, p2]
+
+
+def clip_polylines(points: 'np.array', offsets: 'np.array') -> 'tuple':
+    """Clip polylines against the window.
+
+    Parameters
+    ----------
+        points: (N, 2) points of all polylines, back to back.
+        offsets: Polyline i is points[offsets[i]:offsets[i+1]].
+
+    Returns
+    -------
+        tuple : (segments, joined), where segments is a (V, 2, 2) array of
+        the visible parts of the polylines' segments, in order, and joined
+        is a boolean (V,) mask telling whether each segment starts where
+        the previous one ended, i.e. whether it continues the same path.
+
+    See also
+    --------
+        `clip_segments`
+
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return (np.empty((0, 2, 2)), np.empty(0, dtype=bool))
+    clipped, visible = clip_segments(
+        np.stack((points[:-1], points[1:]), axis=1))
+
+    # Segments joining the last point of a polyline to the next polyline
+    connected = np.ones(len(points) - 1, dtype=bool)
+    offsets = np.asarray(offsets)
+    between = offsets[(offsets > 0) & (offsets < len(points))]
+    connected[between - 1] = False
+    visible &= connected
+
+    joined = np.zeros(len(visible), dtype=bool)
+    joined[1:] = visible[:-1] & np.all(
+        clipped[:-1, 1] == clipped[1:, 0], axis=1)
+    return (clipped[visible], joined[visible])
 
 
 def clip_polygon(points: 'list') -> 'list':
@@ -155,34 +242,80 @@ def clip_polygon(points: 'list') -> 'list':
     return old_points
 
 
-def clip_wireframe(points: 'list', faces: 'list') -> 'tuple':
-    """Clip wireframe by polygon clipping each of it's faces.
+def clip_wireframe(points: 'np.array', faces: 'FaceArray') -> 'tuple':
+    """Clip wireframe by polygon clipping the faces that cross the border.
+
+    Faces whose vertices are all inside the window are kept as they are,
+    and faces whose vertices are all beyond the same border are discarded;
+    both cases are decided at once from the region codes of all vertices.
+    Only the remaining faces are clipped by `clip_polygon`.
+
+    Returns
+    -------
+        tuple : (points, faces), where points are the original (N, 2)
+        points followed by the ones generated by clipping, and faces is a
+        FaceArray indexing them. If no face needs clipping, the original
+        points and faces are returned.
 
     Notes
     -----
-        The method `index` of `list` runs in O(n) time. `clip_wireframe` could
-        be optimized if an ordered set was used instead of list.
+        Generated points are deduplicated through a dictionary, so that
+        faces sharing a clipped edge also share its new vertex. Points are
+        rounded before being hashed, since the intersection of an edge with
+        a border depends slightly on the direction in which the edge is
+        walked.
 
     """
-    def try_add(point: 'tuple') -> 'int':
-        """Add point to `new_points` and return index to it.
-
-        Notes
-        -----
-            If `point` is already on `new_points`, don't repeat point. Instead,
-            return index to existing point.
-        """
-        try:
-            index = new_points.index(point)
-        except ValueError:
-            new_points.append(point)
-            index = len(new_points) - 1
-        return index
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    sizes = np.diff(faces.offsets)
+    non_empty = sizes > 0
+    if not non_empty.any():
+        return (np.empty((0, 2)), FaceArray.from_lists([]))
+
+    codes = region_codes(points)[faces.indices]
+    starts = faces.offsets[:-1][non_empty]
+    union = np.zeros(len(faces), dtype=np.uint8)
+    intersection = np.zeros(len(faces), dtype=np.uint8)
+    union[non_empty] = np.bitwise_or.reduceat(codes, starts)
+    intersection[non_empty] = np.bitwise_and.reduceat(codes, starts)
+
+    inside = non_empty & (union == 0)
+    if inside.all():
+        return (points, faces)
+    crossing = non_empty & (union != 0) & (intersection == 0) & \
+        ((union & NEAR) == 0)
 
     new_points = []
+    generated = {}
     new_faces = []
-    for face in faces:
-        clipped_points = clip_polygon([points[i] for i in face])
-        if clipped_points:
-            new_faces.append([try_add(p) for p in clipped_points])
-    return (new_points, new_faces)
+    for f in np.flatnonzero(crossing).tolist():
+        face = faces[f].tolist()
+        polygon = [tuple(p) for p in points[face].tolist()]
+        original = dict(zip(polygon, face))
+        new_face = []
+        for point in map(tuple, clip_polygon(polygon)):
+            index = original.get(point)
+            if index is None:
+                key = (round(point[0], 9), round(point[1], 9))
+                index = generated.get(key)
+                if index is None:
+                    index = len(points) + len(new_points)
+                    generated[key] = index
+                    new_points.append(point)
+            if not new_face or new_face[-1] != index:
+                new_face.append(index)
+        if len(new_face) > 1 and new_face[0] == new_face[-1]:
+            new_face.pop()
+        if len(new_face) > 1:
+            new_faces.append(new_face)
+
+    if not inside.any() and not new_faces:
+        return (np.empty((0, 2)), FaceArray.from_lists([]))
+    clipped_faces = FaceArray.from_lists(new_faces)
+    indices = np.concatenate(
+        (faces.indices[np.repeat(inside, sizes)], clipped_faces.indices))
+    offsets = np.zeros(inside.sum() + len(new_faces) + 1, dtype=np.int32)
+    np.cumsum(np.concatenate((sizes[inside], np.diff(clipped_faces.offsets))),
+              out=offsets[1:])
+    points = np.concatenate((points, np.reshape(new_points, (-1, 2))))
+    return (points, FaceArray(indices, offsets))
@@ -0,0 +1,50 @@
+"""This module provides view frustum culling utilities.
+
+Notes
+-----
+    The view frustum is the pyramid whose apex is the center of projection
+    and whose cross-sections are the window. In window coordinates (i.e.
+    after applying the window's view matrix, but before the perspective
+    division), a point (x, y, z) is inside the frustum if |x| <= z and
+    |y| <= z.
+
+"""
+import numpy as np
+
+
+def frustum_planes(view_matrix: 'np.array', left=-1, right=1, bottom=-1,
+                   top=1) -> 'np.array':
+    """Frustum planes in world coordinates, with normalized normals.
+
+    Each plane (a, b, c, d) is such that ax + by + cz + d >= 0 inside the
+    frustum. The borders default to the whole window; narrower borders,
+    in normalized window coordinates, give a sub-frustum (e.g. for
+    picking).
+
+    Notes
+    -----
+        Points are row vectors, hence a plane p in window coordinates
+        becomes view_matrix@p in world coordinates.
+
+    """
+    planes = np.array([[1, 0, -left, 0],     # x >= left*z
+                       [-1, 0, right, 0],    # x <= right*z
+                       [0, 1, -bottom, 0],   # y >= bottom*z
+                       [0, -1, top, 0],      # y <= top*z
+                       [0, 0, 1, 0]],        # z >= 0
+                      dtype=np.float64)
+    planes = (view_matrix@planes.T).T
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, np.newaxis]
+
+
+def sphere_in_frustum(center: 'np.array', radius: 'float',
+                      planes: 'np.array') -> 'bool':
+    """Whether a sphere is at least partially inside the frustum.
+
+    Notes
+    -----
+        The test is conservative: spheres near the frustum's edges may be
+        reported as inside although they are not.
+
+    """
+    return bool(np.all(planes[:, :3]@center + planes[:, 3] >= -radius))
@@ -0,0 +1,83 @@
+"""This module provides mesh simplification for levels of detail.
+
+Functions
+---------
+    cluster_vertices
+
+"""
+import numpy as np
+
+from .faces import FaceArray
+
+
+def cluster_vertices(points: 'np.array', faces: 'FaceArray',
+                     grid: 'int') -> 'tuple':
+    """Simplify a mesh by merging the vertices that share a grid cell.
+
+    The mesh's bounding box is divided into `grid` cells along its longest
+    side, and the vertices within each cell are replaced by their mean.
+    Faces are then rewritten in terms of the merged vertices; repeated
+    consecutive vertices are dropped, as are the faces that collapsed.
+    Polygons must keep at least three vertices, whereas two-vertex faces
+    (edges) only need to keep both of theirs.
+
+    Parameters
+    ----------
+        points: (N, 4) homogeneous coordinates of the vertices.
+        grid: Number of cells along the longest side of the bounding box.
+
+    Returns
+    -------
+        tuple : (points, faces) of the simplified mesh.
+
+    References
+    ----------
+        Rossignac, J. and Borrel, P. Multi-resolution 3D approximations for
+        rendering complex scenes (1993)
+
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return (points, faces)
+    xyz = points[:, :3]
+    lo = xyz.min(axis=0)
+    extent = float(np.max(xyz.max(axis=0) - lo))
+    if extent == 0:
+        return (points, faces)
+    cells = np.minimum(((xyz - lo) * (grid / extent)).astype(np.int64),
+                       grid - 1)
+    keys = (cells[:, 0] * grid + cells[:, 1]) * grid + cells[:, 2]
+    _, cluster = np.unique(keys, return_inverse=True)
+    cluster = cluster.ravel()
+
+    counts = np.bincount(cluster)
+    merged = np.stack([np.bincount(cluster, weights=points[:, k]) / counts
+                       for k in range(points.shape[1])], axis=1)
+    return (merged, _collapse_faces(faces, cluster))
+
+
+def _collapse_faces(faces: 'FaceArray', mapping: 'np.array') -> 'FaceArray':
+    """Rewrite faces through a vertex mapping, dropping collapsed ones.
+
+    A face is collapsed if it is left with fewer than min(3, n) distinct
+    vertices, where n is its original size, or with fewer than two.
+
+    """
+    indices = mapping[faces.indices]
+    begin, end = faces.offsets[:-1], faces.offsets[1:]
+    face = np.repeat(np.arange(len(faces)), end - begin)
+
+    # An index is kept if it differs from the previous one in its face; the
+    # first index of a face is compared with the last one.
+    previous = np.arange(-1, len(indices) - 1)
+    non_empty = end > begin
+    previous[begin[non_empty]] = end[non_empty] - 1
+    keep = indices != indices[previous] if len(indices) > 0 else \
+        np.empty(0, dtype=bool)
+
+    sizes = np.bincount(face[keep], minlength=len(faces))
+    proper = sizes >= np.clip(end - begin, 2, 3)
+    keep &= proper[face]
+    offsets = np.zeros(int(proper.sum()) + 1, dtype=np.int32)
+    np.cumsum(sizes[proper], out=offsets[1:])
+    return FaceArray(indices[keep], offsets)
@@ -0,0 +1,119 @@
+"""This module provides a compact representation of polygon faces.
+
+Classes
+-------
+    FaceArray
+
+"""
+import itertools
+
+import numpy as np
+
+
+class FaceArray:
+    """Faces of a polygon mesh in compressed sparse row (CSR) layout.
+
+    The vertex indices of all faces are stored back to back in a flat int32
+    array, and face i spans indices[offsets[i]:offsets[i+1]]. Meshes whose
+    faces all have the same number of vertices (e.g. triangle or quad
+    meshes) can also be viewed as an (F, k) array through `as_array`.
+
+    """
+
+    def __init__(self, indices: 'np.array', offsets: 'np.array'):
+        """Construct FaceArray from flat indices and F+1 offsets."""
+        self._indices = np.asarray(indices, dtype=np.int32)
+        self._offsets = np.asarray(offsets, dtype=np.int32)
+        sizes = np.diff(self._offsets)
+        if len(sizes) > 0 and np.all(sizes == sizes[0]):
+            self._uniform_size = int(sizes[0])
+        else:
+            self._uniform_size = None
+
+    @classmethod
+    def from_lists(cls, faces: 'list') -> 'FaceArray':
+        """Construct FaceArray from one list of indices per face."""
+        offsets = np.zeros(len(faces) + 1, dtype=np.int32)
+        np.cumsum([len(face) for face in faces], out=offsets[1:])
+        indices = np.fromiter(itertools.chain.from_iterable(faces),
+                              dtype=np.int32, count=offsets[-1])
+        return cls(indices, offsets)
+
+    def __getitem__(self, i: 'int') -> 'np.array':
+        """Indices of the i-th face."""
+        return self._indices[self._offsets[i]:self._offsets[i+1]]
+
+    def __iter__(self):
+        """Iterate over the indices of each face."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self):
+        """Number of faces."""
+        return len(self._offsets) - 1
+
+    @property
+    def indices(self) -> 'np.array':
+        """Flat int32 array of vertex indices."""
+        return self._indices
+
+    @property
+    def offsets(self) -> 'np.array':
+        """F+1 offsets; face i spans indices[offsets[i]:offsets[i+1]]."""
+        return self._offsets
+
+    @property
+    def uniform_size(self) -> 'int':
+        """Number of vertices shared by all faces, or None if they differ."""
+        return self._uniform_size
+
+    def as_array(self) -> 'np.array':
+        """(F, k) view of the indices if all faces have k vertices, else None.
+
+        Notes
+        -----
+            This is the fast path for triangle and quad meshes.
+
+        """
+        if self._uniform_size is None:
+            return None
+        return self._indices.reshape(-1, self._uniform_size)
+
+    def tolist(self) -> 'list':
+        """One list of indices per face."""
+        flat = self._indices.tolist()
+        offsets = self._offsets.tolist()
+        return [flat[begin:end] for begin, end in zip(offsets, offsets[1:])]
+
+    def edges(self) -> 'np.array':
+        """(E, 2) array of the mesh's unique undirected edges.
+
+        Notes
+        -----
+            Edges shared by adjacent faces are listed once, and each edge
+            is given with its smaller index first.
+
+        """
+        polygons = self.as_array()
+        if polygons is not None:
+            first = polygons.ravel()
+            second = np.roll(polygons, -1, axis=1).ravel()
+        else:
+            # Each index is followed by the next one in its face, and the
+            # last index of each face wraps around to the first one.
+            following = np.arange(1, len(self._indices) + 1)
+            begin, end = self._offsets[:-1], self._offsets[1:]
+            non_empty = end > begin
+            following[end[non_empty] - 1] = begin[non_empty]
+            first = self._indices
+            second = self._indices[following]
+
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        proper = first != second
+        first = first[proper].astype(np.int64)
+        second = second[proper].astype(np.int64)
+
+        stride = int(second.max()) + 1 if len(second) > 0 else 1
+        keys = np.unique(first * stride + second)
+        return np.stack((keys // stride, keys % stride), axis=1).astype(
+            np.int32)
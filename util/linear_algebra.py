@@ -3,6 +3,10 @@
 import numpy as np
 
 
+NEAR_PLANE = 1e-3
+"""Depth, in view space, at or below which points are not projected."""
+
+
 def translation_matrix(dx, dy, dz):
     """Parameterized translation matrix."""
     return np.array([[1, 0, 0, 0],
@@ -47,4 +51,35 @@ def size(u):
 
 def transformed(points, matrix_tr):
     """Vector after applying linear transformation."""
-    return list(map(lambda p: np.dot(p, matrix_tr), points))
+    return np.asarray(points)@matrix_tr
+
+
+def model_view_matrix(model_matrix, view_matrix):
+    """Single transformation from an object's own to window coordinates."""
+    return model_matrix@view_matrix
+
+
+def perspective_projection(points, matrix_tr, cop_distance=1):
+    """Transform and project (N, 4) `points` onto the z = `cop_distance` plane.
+
+    Returns
+    -------
+        (N, 2) array of projected coordinates.
+
+    Notes
+    -----
+        Points that are not in front of the near plane (z <= `NEAR_PLANE`),
+        i.e. at or behind the center of projection, have no meaningful
+        projection; their coordinates are NaN. The clipping algorithms
+        reject every point, segment and face that involves them.
+
+        `matrix_tr` is expected to be affine, hence the homogeneous
+        coordinate of the transformed points is not computed.
+
+    """
+    points = transformed(points, matrix_tr[:, :3])
+    depth = points[:, 2]
+    front = depth > NEAR_PLANE
+    scale = np.full(len(points), np.nan)
+    scale[front] = cop_distance / depth[front]
+    return points[:, :2] * scale[:, np.newaxis]
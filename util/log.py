@@ -18,6 +18,11 @@ class Logger:
 
     _LOG_LEVEL = LogLevel.INFO
 
+    @staticmethod
+    def set_level(level: 'LogLevel'):
+        """Only log messages of `level` and above from now on."""
+        Logger._LOG_LEVEL = level
+
     @staticmethod
     def log(level, message: 'str'):
         """Log only if the message's log level is high enough."""
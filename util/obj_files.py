@@ -1,49 +1,331 @@
-"""This module provides a parser to Wavefront .obj files."""
+"""This module provides a parser to Wavefront .obj files.
+
+Parsed files are cached in a binary sidecar so that loading the same mesh
+twice doesn't require parsing it twice.
+
+Classes
+-------
+    ObjCache
+    DotObjParser
+
+"""
+from array import array
+import hashlib
+import json
+import os
+import struct
 
 import numpy as np
 
+from .faces import FaceArray
+from .log import Logger, LogLevel
+
+
+DEFAULT_GROUP = "default"
+"""Name of the group that holds faces preceding any 'g' or 'o' statement."""
+
+CACHE_DIR_ENV = "Z_CACHE_DIR"
+"""Environment variable overriding the default cache directory."""
+
+
+def parse_obj(lines: 'iterable') -> 'tuple':
+    """Parse Wavefront .obj statements in a single pass.
+
+    Returns
+    -------
+        tuple : (vertices, groups), where vertices is an (N, 4) array of
+        homogeneous coordinates and groups is a list of
+        (name, indices, offsets) tuples, one for each group that has faces.
+        The faces of a group are stored back to back in the int32 array
+        `indices`; face i spans indices[offsets[i]:offsets[i+1]].
+
+    Notes
+    -----
+        Vertices and faces are accumulated in growable buffers of the
+        `array` module, hence no Python object is allocated per vertex.
+
+        Negative (relative) indices are resolved against the vertices read
+        so far, and only the vertex index of 'v/vt/vn' triplets is kept.
+        Unsupported statements are ignored.
+
+    """
+    vertices = array('d')
+    groups = {}
+    indices, offsets = groups.setdefault(
+        DEFAULT_GROUP, (array('i'), array('i', [0])))
+    n_vertices = 0
+    for line in lines:
+        statement = line.split()
+        if not statement:
+            continue
+        keyword = statement[0]
+        if keyword == "v":
+            vertices.extend((float(statement[1]), float(statement[2]),
+                             float(statement[3]), 1.0))
+            n_vertices += 1
+        elif keyword == "f":
+            for v_vt_vn in statement[1:]:
+                i = int(v_vt_vn.partition("/")[0])
+                # .obj indexes start at 1
+                indices.append(i - 1 if i > 0 else n_vertices + i)
+            offsets.append(len(indices))
+        elif keyword == "g" or keyword == "o":
+            name = "_".join(statement[1:]) or DEFAULT_GROUP
+            indices, offsets = groups.setdefault(
+                name, (array('i'), array('i', [0])))
+
+    vertices = np.frombuffer(vertices, dtype=np.float64).reshape(-1, 4)
+    return (vertices, [
+        (name, np.frombuffer(indices, dtype=np.int32),
+         np.frombuffer(offsets, dtype=np.int32))
+        for name, (indices, offsets) in groups.items() if len(offsets) > 1])
+
+
+def split_groups(vertices: 'np.array', groups: 'list') -> 'list':
+    """Give each group only the vertices it references.
+
+    Returns
+    -------
+        list : (name, points, indices, offsets) tuples, where indices refer
+        to the rows of points.
+
+    """
+    if len(groups) == 1:
+        name, indices, offsets = groups[0]
+        return [(name, vertices, indices, offsets)]
+    meshes = []
+    for name, indices, offsets in groups:
+        used, indices = np.unique(indices, return_inverse=True)
+        meshes.append(
+            (name, vertices[used], indices.astype(np.int32), offsets))
+    return meshes
+
+
+class ObjCache:
+    """Binary cache of parsed .obj files.
+
+    Each source file is cached in its own file of the cache directory with
+    the following layout:
+
+        - 12 byte prefix: magic number, format version and header length.
+        - JSON header: source mtime, size and SHA-1, and the number of
+          vertices, indices and faces of each mesh.
+        - Vertices of all meshes as little-endian float64, shape (V, 4).
+        - Indices of all meshes as little-endian int32.
+        - Offsets of all meshes as little-endian int32.
+
+    The arrays are memory-mapped when loaded, so the meshes returned by
+    `load` are read-only views into the cache file.
+
+    Notes
+    -----
+        A cache file is valid if the source's mtime and size are unchanged,
+        or, failing that, if the source's SHA-1 still matches; in which
+        case the cache file is rewritten with the new mtime and size.
+
+    """
+
+    MAGIC = b"ZOBJ"
+    VERSION = 1
+    _PREFIX = struct.Struct("<4sII")
+    _ALIGNMENT = 16
+
+    def __init__(self, cache_dir: 'str' = None):
+        """Construct ObjCache.
+
+        If `cache_dir` is not given, it is read from the Z_CACHE_DIR
+        environment variable, falling back to ~/.cache/z.
+
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV, os.path.join(
+                os.path.expanduser("~"), ".cache", "z"))
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> 'str':
+        """Directory where cache files are stored."""
+        return self._cache_dir
+
+    def cache_path(self, path: 'str') -> 'str':
+        """Cache file for a given source file."""
+        source = os.path.abspath(path)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        digest = hashlib.sha1(source.encode()).hexdigest()[:16]
+        return os.path.join(self._cache_dir, "{}-{}.zobj".format(stem, digest))
+
+    def load(self, path: 'str') -> 'list':
+        """Meshes cached for `path`, or None if there's no valid cache."""
+        cache_path = self.cache_path(path)
+        try:
+            with open(cache_path, "rb") as cache:
+                magic, version, header_size = ObjCache._PREFIX.unpack(
+                    cache.read(ObjCache._PREFIX.size))
+                if magic != ObjCache.MAGIC or version != ObjCache.VERSION:
+                    return None
+                header = json.loads(cache.read(header_size).decode())
+            stat = os.stat(path)
+            touched = (header["mtime"], header["size"]) != (
+                stat.st_mtime_ns, stat.st_size)
+            if touched and header["sha1"] != _file_digest(path):
+                return None
+            n_vertices = sum(mesh["vertices"] for mesh in header["meshes"])
+            n_indices = sum(mesh["indices"] for mesh in header["meshes"])
+            n_offsets = sum(mesh["faces"] + 1 for mesh in header["meshes"])
+            data = np.memmap(cache_path, dtype=np.uint8, mode="r",
+                             offset=self._data_offset(header_size))
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+        indices_begin = n_vertices*4*8
+        offsets_begin = indices_begin + n_indices*4
+        if len(data) != offsets_begin + n_offsets*4:
+            return None
+        vertices = data[:indices_begin].view("<f8").reshape(-1, 4)
+        indices = data[indices_begin:offsets_begin].view("<i4")
+        offsets = data[offsets_begin:].view("<i4")
+
+        meshes = []
+        for mesh in header["meshes"]:
+            meshes.append((mesh["name"],
+                           vertices[:mesh["vertices"]],
+                           indices[:mesh["indices"]],
+                           offsets[:mesh["faces"] + 1]))
+            vertices = vertices[mesh["vertices"]:]
+            indices = indices[mesh["indices"]:]
+            offsets = offsets[mesh["faces"] + 1:]
+        if touched:
+            # The contents are unchanged; record the new mtime and size so
+            # that later loads take the fast path again.
+            self.store(path, meshes, stat, header["sha1"])
+        return meshes
+
+    def store(self, path: 'str', meshes: 'list', stat: 'os.stat_result',
+              digest: 'str' = None):
+        """Write `meshes` parsed from `path` when it had the given `stat`.
+
+        `digest` is the SHA-1 of `path`, computed if not given.
+
+        Failing to write the cache is not an error; the meshes will simply
+        be parsed again next time.
+
+        """
+        header = json.dumps({
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha1": digest if digest is not None else _file_digest(path),
+            "meshes": [{"name": name,
+                        "vertices": len(points),
+                        "indices": len(indices),
+                        "faces": len(offsets) - 1}
+                       for name, points, indices, offsets in meshes],
+        }).encode()
+        prefix = ObjCache._PREFIX.pack(
+            ObjCache.MAGIC, ObjCache.VERSION, len(header))
+        padding = self._data_offset(len(header)) - len(prefix) - len(header)
+
+        cache_path = self.cache_path(path)
+        temp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as cache:
+                cache.write(prefix + header + b"\0" * padding)
+                for _, points, _, _ in meshes:
+                    np.ascontiguousarray(points, "<f8").tofile(cache)
+                for _, _, indices, _ in meshes:
+                    np.ascontiguousarray(indices, "<i4").tofile(cache)
+                for _, _, _, offsets in meshes:
+                    np.ascontiguousarray(offsets, "<i4").tofile(cache)
+            os.replace(temp_path, cache_path)
+        except OSError as error:
+            try:
+                os.remove(temp_path)
+            except OSError:  # Never created, or already replaced
+                pass
+            Logger.log(LogLevel.WARN, "Could not cache {}: {}".format(
+                path, error))
+
+    @classmethod
+    def _data_offset(cls, header_size: 'int') -> 'int':
+        """Offset of the first array, aligned to `_ALIGNMENT` bytes."""
+        size = cls._PREFIX.size + header_size
+        return -(-size // cls._ALIGNMENT) * cls._ALIGNMENT
+
+
+def _file_digest(path: 'str') -> 'str':
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class DotObjParser:
     """Parser for Wavefront .obj files.
 
     Notes
     -----
-        Constructs only one object for each .obj file. The object is a
-        face element constructed with:
+        Constructs one object for each group in the .obj file. The objects
+        are face elements constructed with:
 
-            name = name of the file containing the vertices
-            points = 'v' statements in the file
-            faces = 'f' statements in the file
+            name = name of the file containing the vertices, followed by
+                   the name of the group if the file has more than one
+            points = 'v' statements referenced by the group
+            faces = 'f' statements in the group
             color = BLACK
 
     """
 
-    def __init__(self, executor: 'Executor'):
-        """Construct DotObjParser."""
+    def __init__(self, executor: 'Executor', cache_dir: 'str' = None):
+        """Construct DotObjParser.
+
+        See also
+        --------
+            `ObjCache`
+
+        """
         self._executor = executor
+        self._cache = ObjCache(cache_dir)
+
+    def load_obj_file(self, path: 'str') -> 'list':
+        """Meshes described by .obj file, read from cache if possible.
+
+        Returns
+        -------
+            list : (name, points, indices, offsets) tuples; one for each
+            group in the file.
+
+        See also
+        --------
+            `parse_obj`
+            `split_groups`
+
+        """
+        meshes = self._cache.load(path)
+        if meshes is None:
+            stat = os.stat(path)
+            with open(path) as obj:
+                vertices, groups = parse_obj(obj)
+            if not groups:
+                groups = [(DEFAULT_GROUP, np.empty(0, dtype=np.int32),
+                           np.zeros(1, dtype=np.int32))]
+            meshes = split_groups(vertices, groups)
+            self._cache.store(path, meshes, stat)
+        return meshes
 
     def compile_obj_file(self, path: 'str') -> 'list':
-        """Return object described by .obj file."""
-        with open(path) as obj:
-            raw_file = obj.read()
-        file_lines = [list(filter(lambda x:x != "", line.split(" ")))
-                      for line in raw_file.split("\n")]
+        """Add objects described by .obj file."""
+        meshes = self.load_obj_file(path)
         obj_name = path.split("/")[-1].split(".")[0]
-        vertices = []
-        faces = []
-        for line in file_lines:
-            if line == []:
-                continue
-            if line[0] == "v":
-                vertices.append(np.array(
-                    [float(line[1]), float(line[2]), float(line[3]), 1]))
-            elif line[0] == "f":
-                # .obj indexes start at 1
-                faces.append(
-                    [int(v_vt_vn.split("/")[0])-1 for v_vt_vn in line[1:]])
-        self._executor.add(
-            name=obj_name,
-            points=vertices,
-            faces=faces,
-            color=(0.0, 0.0, 0.0),
-            obj_type="Wireframe")
+        with self._executor.batch():
+            for group_name, points, indices, offsets in meshes:
+                name = obj_name
+                if len(meshes) > 1:
+                    name = "{}_{}".format(obj_name, group_name)
+                self._executor.add(
+                    name=name,
+                    points=points,
+                    faces=FaceArray(indices, offsets),
+                    color=(0.0, 0.0, 0.0),
+                    obj_type="Wireframe")
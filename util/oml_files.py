@@ -1,4 +1,508 @@
-"""This module provides a parser to .oml files."""
+"""This module provides a parser to .oml files.
+
+Object Manipulation Language (OML) commands are parsed in a single pass
+over each line: the command is dispatched on its keyword, and its operands
+are matched by one compiled pattern each and converted straight into
+arrays. Malformed commands raise an OmlSyntaxError that tells the line and
+column where parsing failed.
+
+The grammar of the language is the following:
+
+    command     = add | remove | translate | scale | rotate
+    add         = "add" type "(" name "," points
+                  ["," interpolator] ["," interpolator] ["," faces] ")"
+    remove      = "remove(" name ")"
+    translate   = "translate(" name "," number "," number "," number ")"
+    scale       = "scale(" name "," number ")"
+    rotate      = "rotate(" name "," number "," number "," number ")"
+    type        = "c" | "l" | "p" | "s" | "w"
+    points      = point {";" point}
+    point       = number "," number "," number
+    faces       = face {";" face}
+    face        = natural {"-" natural}
+    interpolator = "bezier" | "bspline"
+
+Scripts may also be compiled into an OmlProgram, a compact intermediate
+representation that is cached next to the source, so that running the
+same script again skips parsing.
+
+Classes
+-------
+    OmlSyntaxError
+    OmlCommand
+    OmlProgram
+    DotOmlParser
+
+"""
+from collections import namedtuple
+import hashlib
+import json
+import os
+import re
+import struct
+
+import numpy as np
+
+from .faces import FaceArray
+from .log import Logger, LogLevel
+
+
+_number = r"-?\d+(?:\.\d*)?"
+_face = r"\d+(?:-\d+)*"
+
+_KEYWORD = re.compile(r"[a-z]+")
+_NAME = re.compile(r"[a-zA-Z][a-zA-Z0-9_]*")
+_NUMBER = re.compile(_number)
+_POINTS = re.compile(r"(?:{0},{0},{0};)*{0},{0},{0}".format(_number))
+_FACES = re.compile(r"(?:{0};)*{0}".format(_face))
+_INTERPOLATOR = re.compile(r"(?:bezier|bspline)(?=[,)])")
+_COMMA = re.compile(",")
+_FACE_SEPARATORS = re.compile(r"[-;]")
+
+ADD_TYPES = "clpsw"
+"""Suffixes of `add` for curves, lines, points, surfaces and wireframes."""
+
+
+class OmlSyntaxError(SyntaxError):
+    """Malformed OML command.
+
+    The location of the error is given by the `filename`, `lineno` and
+    `offset` (column, starting at 1) attributes of SyntaxError.
+
+    """
+
+    def __init__(self, message: 'str', text: 'str', line: 'int',
+                 column: 'int', filename: 'str' = None):
+        """Construct OmlSyntaxError."""
+        super().__init__(message, (filename, line, column, text))
+
+    def __str__(self):
+        """Cohersion to string."""
+        return "{}:{}:{}: {}".format(
+            self.filename or "<oml>", self.lineno, self.offset, self.msg)
+
+
+OmlCommand = namedtuple(
+    "OmlCommand", ["keyword", "name", "values", "options", "faces", "line"])
+OmlCommand.__doc__ = """Parsed OML command.
+
+    keyword: Command keyword, with the type of `add` in `options`.
+    name: Name of the object the command refers to.
+    values: float64 operands; (N, 3) points for `add`, (3,) offsets or
+            angles for `translate` and `rotate`, (1,) factor for `scale`,
+            and empty for `remove`.
+    options: For `add`, the type of object followed by the names of the
+             interpolators, if any; empty otherwise.
+    faces: FaceArray for `add`, if faces were given; None otherwise.
+    line: Line of the command in its source.
+"""
+
+
+class _Scanner:
+    """Cursor over a single command that raises located errors."""
+
+    def __init__(self, text: 'str', line: 'int', filename: 'str'):
+        """Construct _Scanner at the beginning of `text`."""
+        self.text = text
+        self.pos = 0
+        self.line = line
+        self.filename = filename
+
+    def error(self, message: 'str', pos: 'int' = None) -> 'OmlSyntaxError':
+        """Error at `pos`, which defaults to the current position."""
+        if pos is None:
+            pos = self.pos
+        return OmlSyntaxError(
+            message, self.text, self.line, pos + 1, self.filename)
+
+    def match(self, pattern: 're.Pattern', what: 'str') -> 'str':
+        """Consume and return the text matched by `pattern`."""
+        match = pattern.match(self.text, self.pos)
+        if match is None:
+            raise self.error("expected " + what)
+        self.pos = match.end()
+        return match.group()
+
+    def accept(self, pattern: 're.Pattern') -> 'str':
+        """Consume and return the text matched by `pattern`, if any."""
+        match = pattern.match(self.text, self.pos)
+        if match is None:
+            return None
+        self.pos = match.end()
+        return match.group()
+
+    def expect(self, char: 'str'):
+        """Consume `char`."""
+        if not self.text.startswith(char, self.pos):
+            raise self.error("expected '{}'".format(char))
+        self.pos += len(char)
+
+    def numbers(self, count: 'int') -> 'np.array':
+        """Consume `count` comma separated numbers."""
+        values = [float(self.match(_NUMBER, "number"))]
+        for _ in range(count - 1):
+            self.expect(",")
+            values.append(float(self.match(_NUMBER, "number")))
+        return np.array(values)
+
+    def end(self):
+        """Consume the closing parenthesis, which must end the command."""
+        self.expect(")")
+        if self.pos != len(self.text):
+            raise self.error("unexpected text after command")
+
+
+def _parse_add(scanner: '_Scanner', keyword: 'str') -> 'OmlCommand':
+    """Parse the operands of `add`, whose type is the keyword's suffix."""
+    obj_type = keyword[3:]
+    if len(obj_type) != 1 or obj_type not in ADD_TYPES:
+        raise scanner.error("unknown type of object", 3)
+    scanner.expect("(")
+    name = scanner.match(_NAME, "name")
+    scanner.expect(",")
+    points = scanner.match(_POINTS, "points")
+    values = np.array(points.replace(";", ",").split(","),
+                      dtype=np.float64).reshape(-1, 3)
+
+    options = [obj_type]
+    faces = None
+    while scanner.accept(_COMMA) is not None:
+        if len(options) < 3:
+            interpolator = scanner.accept(_INTERPOLATOR)
+            if interpolator is not None:
+                options.append(interpolator)
+                continue
+        text = scanner.match(_FACES, "faces")
+        indices = np.array(_FACE_SEPARATORS.split(text), dtype=np.int32)
+        offsets = np.zeros(text.count(";") + 2, dtype=np.int32)
+        np.cumsum([face.count("-") + 1 for face in text.split(";")],
+                  out=offsets[1:])
+        faces = FaceArray(indices, offsets)
+        break
+    scanner.end()
+    return OmlCommand(
+        "add", name, values, tuple(options), faces, scanner.line)
+
+
+def _parser(count: 'int') -> 'function':
+    """Parser of commands taking a name and `count` numbers."""
+    def parse(scanner: '_Scanner', keyword: 'str') -> 'OmlCommand':
+        """Parse the operands of `keyword`."""
+        scanner.expect("(")
+        name = scanner.match(_NAME, "name")
+        if count > 0:
+            scanner.expect(",")
+            values = scanner.numbers(count)
+        else:
+            values = np.empty(0)
+        scanner.end()
+        return OmlCommand(keyword, name, values, (), None, scanner.line)
+    return parse
+
+
+_PARSERS = {
+    "remove": _parser(0),
+    "translate": _parser(3),
+    "scale": _parser(1),
+    "rotate": _parser(3),
+}
+
+
+def parse_command(text: 'str', line: 'int' = 1,
+                  filename: 'str' = None) -> 'OmlCommand':
+    """Parse a single OML command.
+
+    Raises
+    ------
+        OmlSyntaxError
+            The command is malformed.
+
+    """
+    scanner = _Scanner(text, line, filename)
+    keyword = scanner.match(_KEYWORD, "command")
+    if keyword.startswith("add"):
+        return _parse_add(scanner, keyword)
+    parse = _PARSERS.get(keyword)
+    if parse is None:
+        raise scanner.error("unknown command '{}'".format(keyword), 0)
+    return parse(scanner, keyword)
+
+
+def parse_oml(lines: 'iterable', filename: 'str' = None) -> 'tuple':
+    """Parse OML commands, one per line.
+
+    Blank lines and lines starting with '#' are skipped, as are leading and
+    trailing whitespace.
+
+    Returns
+    -------
+        tuple : (commands, errors), the list of OmlCommands parsed and the
+        list of OmlSyntaxErrors raised by malformed lines.
+
+    """
+    commands = []
+    errors = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line[0] == "#":
+            continue
+        try:
+            commands.append(parse_command(line, number, filename))
+        except OmlSyntaxError as error:
+            errors.append(error)
+    return (commands, errors)
+
+
+KEYWORDS = ("add", "remove", "translate", "scale", "rotate")
+"""Commands of the language, in the order of their opcodes."""
+
+INTERPOLATOR_NAMES = ("bezier", "bspline")
+"""Interpolators of the language, in the order of their codes."""
+
+
+class OmlProgram:
+    """OML script compiled to a compact intermediate representation.
+
+    Each command is an operation with an opcode (its index in `KEYWORDS`)
+    and three option codes: the type of object (index in `ADD_TYPES`, plus
+    one) and the two interpolators (index in `INTERPOLATOR_NAMES`, plus
+    one), 0 meaning none. Names and operands are packed back to back in
+    flat arrays, CSR style:
+
+        - names: utf-8 bytes; command i's name spans
+          names[name_offsets[i]:name_offsets[i+1]].
+        - values: float64; command i's operands span
+          values[value_offsets[i]:value_offsets[i+1]].
+        - face_indices and face_offsets: faces of all commands, as in a
+          FaceArray; command i's faces are faces face_ptr[i] through
+          face_ptr[i+1] - 1.
+
+    Programs are serialized to bytes with the following layout:
+
+        - 12 byte prefix: magic number, format version and header length.
+        - JSON header: SHA-1 of the source, syntax errors, and the length
+          of each array.
+        - Arrays, in the order of `_ARRAYS`, as little-endian values, each
+          aligned to 8 bytes.
+
+    """
+
+    MAGIC = b"ZOML"
+    VERSION = 1
+    _PREFIX = struct.Struct("<4sII")
+    _ALIGNMENT = 8
+    _ARRAYS = (
+        ("opcodes", "<u1"), ("options", "<u1"), ("lines", "<i4"),
+        ("names", "<u1"), ("name_offsets", "<i4"),
+        ("values", "<f8"), ("value_offsets", "<i4"),
+        ("face_indices", "<i4"), ("face_offsets", "<i4"),
+        ("face_ptr", "<i4"),
+    )
+
+    def __init__(self, arrays: 'dict', errors: 'list', digest: 'str' = ""):
+        """Construct OmlProgram from its arrays.
+
+        See also
+        --------
+            `from_commands`
+            `from_bytes`
+
+        """
+        self._arrays = arrays
+        self._errors = errors
+        self._digest = digest
+
+    def __len__(self):
+        """Number of commands."""
+        return len(self._arrays["opcodes"])
+
+    @property
+    def digest(self) -> 'str':
+        """SHA-1 of the source the program was compiled from."""
+        return self._digest
+
+    @property
+    def errors(self) -> 'list':
+        """OmlSyntaxErrors raised while compiling the program."""
+        return self._errors
+
+    @classmethod
+    def from_commands(cls, commands: 'list', errors: 'list' = (),
+                      digest: 'str' = "") -> 'OmlProgram':
+        """Pack parsed commands."""
+        opcodes = np.empty(len(commands), dtype=np.uint8)
+        options = np.zeros((len(commands), 3), dtype=np.uint8)
+        lines = np.empty(len(commands), dtype=np.int32)
+        names = []
+        values = []
+        face_indices = []
+        face_sizes = []
+        face_counts = np.zeros(len(commands), dtype=np.int32)
+        for i, command in enumerate(commands):
+            opcodes[i] = KEYWORDS.index(command.keyword)
+            if command.options:
+                options[i, 0] = ADD_TYPES.index(command.options[0]) + 1
+                for j, name in enumerate(command.options[1:], 1):
+                    options[i, j] = INTERPOLATOR_NAMES.index(name) + 1
+            lines[i] = command.line
+            names.append(command.name.encode())
+            values.append(np.ravel(command.values))
+            if command.faces is not None:
+                face_indices.append(command.faces.indices)
+                face_sizes.append(np.diff(command.faces.offsets))
+                face_counts[i] = len(command.faces)
+
+        return cls({
+            "opcodes": opcodes,
+            "options": options.ravel(),
+            "lines": lines,
+            "names": np.frombuffer(b"".join(names), dtype=np.uint8),
+            "name_offsets": _offsets([len(name) for name in names]),
+            "values": np.concatenate(values) if values else np.empty(0),
+            "value_offsets": _offsets([len(v) for v in values]),
+            "face_indices": np.concatenate(face_indices).astype(np.int32)
+            if face_indices else np.empty(0, dtype=np.int32),
+            "face_offsets": _offsets(
+                np.concatenate(face_sizes) if face_sizes else []),
+            "face_ptr": _offsets(face_counts),
+        }, list(errors), digest)
+
+    @classmethod
+    def from_bytes(cls, data: 'bytes', filename: 'str' = None) -> 'OmlProgram':
+        """Unpack serialized program; the arrays are views into `data`.
+
+        Raises
+        ------
+            ValueError
+                `data` is not a serialized program of this version.
+
+        """
+        try:
+            magic, version, header_size = cls._PREFIX.unpack_from(data)
+        except struct.error as error:
+            raise ValueError("not a compiled OML program") from error
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("not a compiled OML program")
+        start = cls._PREFIX.size
+        header = json.loads(bytes(data[start:start + header_size]).decode())
+        offset = _align(start + header_size, cls._ALIGNMENT)
+        arrays = {}
+        for name, dtype in cls._ARRAYS:
+            length = header["lengths"][name]
+            arrays[name] = np.frombuffer(
+                data, dtype=dtype, count=length, offset=offset)
+            offset = _align(offset + arrays[name].nbytes, cls._ALIGNMENT)
+        errors = [OmlSyntaxError(msg, text, line, column, filename)
+                  for msg, text, line, column in header["errors"]]
+        return cls(arrays, errors, header["sha1"])
+
+    def to_bytes(self) -> 'bytes':
+        """Serialize program."""
+        header = json.dumps({
+            "sha1": self._digest,
+            "errors": [(error.msg, error.text, error.lineno, error.offset)
+                       for error in self._errors],
+            "lengths": {name: len(self._arrays[name])
+                        for name, _ in OmlProgram._ARRAYS},
+        }).encode()
+        chunks = [OmlProgram._PREFIX.pack(
+            OmlProgram.MAGIC, OmlProgram.VERSION, len(header)), header]
+        size = sum(map(len, chunks))
+        for name, dtype in OmlProgram._ARRAYS:
+            padding = _align(size, OmlProgram._ALIGNMENT) - size
+            chunk = np.ascontiguousarray(self._arrays[name], dtype).tobytes()
+            chunks += [b"\0" * padding, chunk]
+            size += padding + len(chunk)
+        return b"".join(chunks)
+
+    def commands(self) -> 'list':
+        """Unpack the program into OmlCommands."""
+        a = self._arrays
+        names = a["names"].tobytes()
+        name_offsets = a["name_offsets"].tolist()
+        value_offsets = a["value_offsets"].tolist()
+        face_ptr = a["face_ptr"].tolist()
+        options = a["options"].reshape(-1, 3).tolist()
+        values = a["values"]
+        commands = []
+        for i, (opcode, line) in enumerate(
+                zip(a["opcodes"].tolist(), a["lines"].tolist())):
+            keyword = KEYWORDS[opcode]
+            operands = values[value_offsets[i]:value_offsets[i+1]]
+            obj_type, *interpolators = options[i]
+            if keyword == "add":
+                operands = operands.reshape(-1, 3)
+                command_options = (ADD_TYPES[obj_type - 1],) + tuple(
+                    INTERPOLATOR_NAMES[code - 1]
+                    for code in interpolators if code > 0)
+            else:
+                command_options = ()
+            faces = None
+            if face_ptr[i+1] > face_ptr[i]:
+                offsets = a["face_offsets"][face_ptr[i]:face_ptr[i+1] + 1]
+                faces = FaceArray(
+                    a["face_indices"][offsets[0]:offsets[-1]],
+                    offsets - offsets[0])
+            commands.append(OmlCommand(
+                keyword,
+                names[name_offsets[i]:name_offsets[i+1]].decode(),
+                operands, command_options, faces, line))
+        return commands
+
+
+def _offsets(sizes: 'list') -> 'np.array':
+    """Offsets of consecutive chunks of given sizes, starting at 0."""
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+    return offsets
+
+
+def _align(size: 'int', alignment: 'int') -> 'int':
+    """Round `size` up to a multiple of `alignment`."""
+    return -(-size // alignment) * alignment
+
+
+def compile_oml_file(path: 'str') -> 'OmlProgram':
+    """Compile .oml file, reusing its compiled cache if it is up to date.
+
+    The compiled program is cached in a file next to the source, with the
+    same name followed by 'c' (e.g. scene.oml and scene.omlc). It is valid
+    as long as the SHA-1 of the source matches the one it was compiled
+    from.
+
+    Notes
+    -----
+        Failing to write the cache is not an error; the source will simply
+        be parsed again next time.
+
+    """
+    with open(path, "rb") as oml:
+        source = oml.read()
+    digest = hashlib.sha1(source).hexdigest()
+    cache_path = path + "c"
+    try:
+        with open(cache_path, "rb") as cache:
+            program = OmlProgram.from_bytes(cache.read(), path)
+        if program.digest == digest:
+            return program
+    except (OSError, ValueError, KeyError):
+        pass
+
+    commands, errors = parse_oml(source.decode().splitlines(), path)
+    program = OmlProgram.from_commands(commands, errors, digest)
+    temp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        with open(temp_path, "wb") as cache:
+            cache.write(program.to_bytes())
+        os.replace(temp_path, cache_path)
+    except OSError as error:
+        try:
+            os.remove(temp_path)
+        except OSError:  # Never created, or already replaced
+            pass
+        Logger.log(LogLevel.WARN, "Could not cache {}: {}".format(
+            path, error))
+    return program
 
 
 class DotOmlParser:
@@ -6,8 +510,14 @@ class DotOmlParser:
 
     Notes
     -----
-        The parser breaks the file into one-line commands, then
-        forwards each one to the underlying interpreter.
+        The whole file is compiled, or loaded from its compiled cache,
+        before any command is executed; malformed lines are logged with
+        their location and skipped. The commands are then executed by the
+        underlying interpreter as a single batch, see `Executor.batch`.
+
+    See also
+    --------
+        `compile_oml_file`
 
     """
 
@@ -17,10 +527,9 @@ class DotOmlParser:
 
     def interpret_oml_file(self, path: 'str'):
         """Interpret commands from .oml file."""
-        with open(path) as obj:
-            raw_file = obj.read()
-        file_lines = raw_file.split("\n")
-        for line in file_lines:
-            if line == "" or line[0] == "#":
-                continue
-            self._interpreter.interpret(line)
+        program = compile_oml_file(path)
+        for error in program.errors:
+            Logger.log(LogLevel.ERRO, str(error))
+        with self._interpreter.executor.batch():
+            for command in program.commands():
+                self._interpreter.execute(command)
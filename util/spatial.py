@@ -0,0 +1,260 @@
+"""This module provides a spatial index for visibility queries.
+
+Classes
+-------
+    BoundingVolumeHierarchy
+
+"""
+import numpy as np
+
+
+def _area(lo: 'np.array', hi: 'np.array') -> 'float':
+    """Surface area of an axis-aligned box."""
+    dx, dy, dz = hi - lo
+    return 2 * (dx*dy + dy*dz + dz*dx)
+
+
+class _Node:
+    """Node of a BoundingVolumeHierarchy; leaves have no children."""
+
+    __slots__ = ("lo", "hi", "key", "parent", "left", "right", "height")
+
+    def __init__(self, lo: 'np.array', hi: 'np.array', key=None):
+        """Construct node."""
+        self.lo = lo
+        self.hi = hi
+        self.key = key
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.height = 0
+
+    @property
+    def is_leaf(self) -> 'bool':
+        """Whether the node holds an item."""
+        return self.left is None
+
+    def refit(self):
+        """Recompute box and height from children."""
+        self.lo = np.minimum(self.left.lo, self.right.lo)
+        self.hi = np.maximum(self.left.hi, self.right.hi)
+        self.height = 1 + max(self.left.height, self.right.height)
+
+
+class BoundingVolumeHierarchy:
+    """Dynamic tree of axis-aligned bounding boxes.
+
+    Every item is a leaf holding its box, and every internal node holds the
+    union of its children's boxes. Items are inserted next to the sibling
+    that least increases the tree's surface area, and the tree is
+    rebalanced by rotations on the way back up, so that its height stays
+    logarithmic in the number of items.
+
+    Operations:
+    - insert
+    - remove
+    - update
+    - query
+
+    References
+    ----------
+        Box2D's b2DynamicTree, https://box2d.org
+
+    """
+
+    def __init__(self):
+        """Construct empty hierarchy."""
+        self._root = None
+        self._leaves = {}
+
+    def __contains__(self, key) -> 'bool':
+        """Whether `key` names an item."""
+        return key in self._leaves
+
+    def __len__(self):
+        """Number of items."""
+        return len(self._leaves)
+
+    @property
+    def height(self) -> 'int':
+        """Height of the tree; -1 if it is empty."""
+        return self._root.height if self._root is not None else -1
+
+    def insert(self, key, lo: 'np.array', hi: 'np.array'):
+        """Insert item `key` with box [`lo`, `hi`].
+
+        Raises
+        ------
+            KeyError
+                `key` already names an item.
+
+        """
+        if key in self._leaves:
+            raise KeyError(key)
+        leaf = _Node(np.asarray(lo, dtype=np.float64),
+                     np.asarray(hi, dtype=np.float64), key)
+        self._leaves[key] = leaf
+        if self._root is None:
+            self._root = leaf
+            return
+
+        sibling = self._best_sibling(leaf)
+        parent = _Node(None, None)
+        parent.parent = sibling.parent
+        parent.left = sibling
+        parent.right = leaf
+        self._replace(sibling, parent)
+        sibling.parent = parent
+        leaf.parent = parent
+        self._refit_upwards(parent)
+
+    def remove(self, key):
+        """Remove item `key`.
+
+        Raises
+        ------
+            KeyError
+                `key` does not name an item.
+
+        """
+        leaf = self._leaves.pop(key)
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+        self._replace(parent, sibling)
+        sibling.parent = parent.parent
+        if sibling.parent is not None:
+            self._refit_upwards(sibling.parent)
+
+    def update(self, key, lo: 'np.array', hi: 'np.array'):
+        """Move item `key` to box [`lo`, `hi`]."""
+        self.remove(key)
+        self.insert(key, lo, hi)
+
+    def query(self, planes: 'np.array') -> 'list':
+        """Keys of items whose boxes intersect a convex volume.
+
+        The volume is given by planes (a, b, c, d) such that
+        ax + by + cz + d >= 0 inside of it (e.g. a view frustum).
+
+        Notes
+        -----
+            Subtrees completely outside of one of the planes are skipped,
+            and subtrees completely inside of all of them are collected
+            without further tests.
+
+        """
+        found = []
+        if self._root is None:
+            return found
+        normals = planes[:, :3]
+        offsets = planes[:, 3]
+        positive = normals >= 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            farthest = np.where(positive, node.hi, node.lo)
+            if np.any(np.sum(normals*farthest, axis=1) + offsets < 0):
+                continue
+            nearest = np.where(positive, node.lo, node.hi)
+            if np.all(np.sum(normals*nearest, axis=1) + offsets >= 0):
+                self._collect(node, found)
+            elif node.is_leaf:
+                found.append(node.key)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+    def _best_sibling(self, leaf: '_Node') -> '_Node':
+        """Node whose pairing with `leaf` least increases surface area."""
+        node = self._root
+        while not node.is_leaf:
+            area = _area(node.lo, node.hi)
+            combined = _area(np.minimum(node.lo, leaf.lo),
+                             np.maximum(node.hi, leaf.hi))
+            # Cost of pairing with node, and of descending below it
+            cost = 2 * combined
+            inheritance = 2 * (combined - area)
+
+            child_costs = []
+            for child in (node.left, node.right):
+                child_cost = _area(np.minimum(child.lo, leaf.lo),
+                                   np.maximum(child.hi, leaf.hi))
+                if not child.is_leaf:
+                    child_cost -= _area(child.lo, child.hi)
+                child_costs.append(child_cost + inheritance)
+
+            if cost < child_costs[0] and cost < child_costs[1]:
+                break
+            node = node.left if child_costs[0] < child_costs[1] else \
+                node.right
+        return node
+
+    def _replace(self, old: '_Node', new: '_Node'):
+        """Put `new` in the place of `old` within `old`'s parent."""
+        parent = old.parent
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _refit_upwards(self, node: '_Node'):
+        """Rebalance and refit boxes from `node` up to the root."""
+        while node is not None:
+            node = self._balance(node)
+            node.refit()
+            node = node.parent
+
+    def _balance(self, a: '_Node') -> '_Node':
+        """Rotate the taller child of `a` up if `a` is unbalanced.
+
+        Returns
+        -------
+            _Node : The node now in `a`'s place.
+
+        """
+        if a.is_leaf or a.height < 2:
+            return a
+        b, c = a.left, a.right
+        balance = c.height - b.height
+        if -1 <= balance <= 1:
+            return a
+
+        # Rotate up the taller child, t, and give its shorter child to a
+        if balance > 1:
+            t = c
+        else:
+            t = b
+        tall, short = (t.left, t.right) if t.left.height > t.right.height \
+            else (t.right, t.left)
+        self._replace(a, t)
+        t.parent = a.parent
+        a.parent = t
+        t.left = a
+        t.right = tall
+        tall.parent = t
+        if t is c:
+            a.right = short
+        else:
+            a.left = short
+        short.parent = a
+        a.refit()
+        t.refit()
+        return t
+
+    def _collect(self, node: '_Node', found: 'list'):
+        """Append the keys of all leaves below `node` to `found`."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf:
+                found.append(node.key)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
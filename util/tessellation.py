@@ -0,0 +1,247 @@
+"""This module provides vectorized tessellation of splines.
+
+Splines are sampled either uniformly, with a fixed number of samples per
+segment, or adaptively, with as many samples as needed for the resulting
+polylines to be within a given distance (the flatness tolerance) of the
+splines.
+
+Notes
+-----
+    A segment of a spline with basis matrix M and geometry G is given by
+
+        P(t) = [t^3 t^2 t 1] M G, for t in [0, 1].
+
+    Hence, sampling n + 1 evenly spaced values of t for every segment of a
+    spline is a single product T M G, where the rows of T hold the powers
+    of each value of t. Likewise, a bicubic patch is given by
+
+        S(s, t) = [s^3 s^2 s 1] Mu G Mv^T [t^3 t^2 t 1]^T.
+
+    Adaptive tessellation works on the Bezier control points of each
+    segment, which are given by B^-1 M G, B being the Bezier basis. A
+    Bezier segment lies within the convex hull of its control points, and
+    its distance to its chord is bounded by the distance of the control
+    points to the chord.
+
+References
+----------
+    Wang's formula, in Goldman, R. Pyramid Algorithms (2003), sec. 5.6.3
+
+"""
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from .clipping import NEAR, region_codes
+
+
+@lru_cache(maxsize=None)
+def power_basis(n: 'int', degree: 'int' = 3) -> 'np.array':
+    """(n+1, degree+1) matrix of powers [t^degree ... t 1] for t in [0, 1].
+
+    Notes
+    -----
+        The matrix is cached, hence it is read-only.
+
+    """
+    t = np.linspace(0, 1, n + 1)
+    powers = t[:, np.newaxis] ** np.arange(degree, -1, -1)
+    powers.flags.writeable = False
+    return powers
+
+
+@lru_cache(maxsize=None)
+def bezier_basis(degree: 'int' = 3) -> 'np.array':
+    """Bezier basis matrix of a given degree (read-only).
+
+    Notes
+    -----
+        Column j holds the coefficients of the Bernstein polynomial
+        C(d, j) t^j (1-t)^(d-j), from t^d down to 1.
+
+    """
+    basis = np.zeros((degree + 1, degree + 1))
+    for j in range(degree + 1):
+        for m in range(j, degree + 1):
+            basis[degree - m, j] = \
+                comb(degree, j) * comb(degree - j, m - j) * (-1)**(m - j)
+    basis.flags.writeable = False
+    return basis
+
+
+def bezier_control_points(basis: 'np.array',
+                          geometry: 'np.array') -> 'np.array':
+    """Bezier control points of segments given in another basis.
+
+    Parameters
+    ----------
+        basis: (d, d) basis matrix, e.g. an Interpolator.
+        geometry: (..., d, 2) control points of each segment.
+
+    """
+    return np.linalg.solve(bezier_basis(basis.shape[0] - 1),
+                           basis@np.asarray(geometry, dtype=np.float64))
+
+
+def tessellate_segments(basis: 'np.array', geometry: 'np.array',
+                        n: 'int') -> 'np.array':
+    """Sample n + 1 points of each segment of a spline.
+
+    Parameters
+    ----------
+        basis: (d, d) basis matrix, e.g. an Interpolator.
+        geometry: (S, d, 2) control points of each of the S segments.
+
+    Returns
+    -------
+        (S, n+1, 2) array; one polyline per segment.
+
+    """
+    geometry = np.asarray(geometry, dtype=np.float64)
+    return power_basis(n, basis.shape[0] - 1)@(basis@geometry)
+
+
+def tessellate_patch(bmatu: 'np.array', bmatv: 'np.array',
+                     geometry: 'np.array', nu: 'int',
+                     nv: 'int' = None) -> 'np.array':
+    """Sample an (nu+1) x (nv+1) grid of points of a spline patch.
+
+    Parameters
+    ----------
+        bmatu, bmatv: Basis matrices in the u and v directions.
+        geometry: (du, dv, 2) control points of the patch.
+        nv: Defaults to `nu`.
+
+    Returns
+    -------
+        (nu+1, nv+1, 2) array, where [i, j] is the point at (s_i, t_j). Its
+        rows and columns are the polylines of the two families of curves.
+
+    """
+    if nv is None:
+        nv = nu
+    geometry = np.asarray(geometry, dtype=np.float64)
+    u = power_basis(nu, bmatu.shape[0] - 1)@bmatu
+    v = power_basis(nv, bmatv.shape[0] - 1)@bmatv
+    return np.einsum('ai,ijc,bj->abc', u, geometry, v)
+
+
+def flatness(control: 'np.array') -> 'np.array':
+    """Bound on the distance of Bezier segments to their chords.
+
+    Parameters
+    ----------
+        control: (S, d+1, 2) Bezier control points of S segments.
+
+    Returns
+    -------
+        (S,) array with the largest distance of each segment's control
+        points to the matching points of its chord.
+
+    """
+    degree = control.shape[1] - 1
+    weights = np.linspace(0, 1, degree + 1)[:, np.newaxis]
+    chord = (1 - weights) * control[:, :1] + weights * control[:, -1:]
+    return np.max(np.linalg.norm(control - chord, axis=2), axis=1)
+
+
+def uniform_samples(control: 'np.array', tolerance: 'float',
+                    limit: 'int' = 1024) -> 'int':
+    """Number of uniform samples that keep Bezier curves within tolerance.
+
+    Parameters
+    ----------
+        control: (..., d+1, 2) Bezier control points.
+        limit: Largest number of samples returned.
+
+    Notes
+    -----
+        By Wang's formula, sampling a degree d curve n times makes a
+        polyline within `tolerance` of it if
+
+            n >= sqrt(d(d-1)/8 * L / tolerance),
+
+        L being the largest second difference of its control points.
+
+    """
+    degree = control.shape[-2] - 1
+    if degree < 2:
+        return 1
+    second = control[..., 2:, :] - 2*control[..., 1:-1, :] + \
+        control[..., :-2, :]
+    norms = np.linalg.norm(second, axis=-1)
+    # Unprojected (NaN) control points don't need any samples
+    length = float(np.max(norms[np.isfinite(norms)], initial=0))
+    samples = np.ceil(np.sqrt(degree*(degree - 1)/8 * length / tolerance))
+    return int(min(max(samples, 1), limit))
+
+
+def subdivide_segments(basis: 'np.array', geometry: 'np.array',
+                       tolerance: 'float', max_depth: 'int' = 10) -> 'tuple':
+    """Sample each segment of a spline by adaptive subdivision.
+
+    Each segment is converted to Bezier form and recursively split in
+    halves (de Casteljau) until its pieces are within `tolerance` of their
+    chords. Pieces lying outside of the normalized window are not split
+    further, since they will be clipped anyway. All pieces at the same
+    depth are tested and split at once.
+
+    Parameters
+    ----------
+        basis: (d, d) basis matrix, e.g. an Interpolator.
+        geometry: (S, d, 2) control points of each of the S segments.
+        max_depth: Largest number of times a segment is halved.
+
+    Returns
+    -------
+        tuple : (points, offsets), where the polyline sampling segment i
+        is points[offsets[i]:offsets[i+1]].
+
+    """
+    control = bezier_control_points(basis, geometry)
+    n_segments = len(control)
+    ends = control[:, -1]
+    pieces = []  # (segment, start parameter, start point) of flat pieces
+    segment = np.arange(n_segments)
+    start = np.zeros(n_segments)
+    for depth in range(max_depth + 1):
+        if len(control) == 0:
+            break
+        codes = region_codes(control)
+        # Pieces with unprojected (NaN) control points are rejected by
+        # clipping, hence they aren't split either.
+        outside = (np.bitwise_and.reduce(codes, axis=1) |
+                   (np.bitwise_or.reduce(codes, axis=1) & NEAR)) != 0
+        done = outside | (flatness(control) <= tolerance)
+        if depth == max_depth:
+            done[:] = True
+        pieces.append((segment[done], start[done], control[done, 0]))
+
+        left, right = _split(control[~done])
+        control = np.concatenate((left, right))
+        segment = np.tile(segment[~done], 2)
+        start = np.concatenate(
+            (start[~done], start[~done] + 0.5**(depth + 1)))
+
+    # Every segment ends at its last control point
+    segment = np.concatenate(
+        [p[0] for p in pieces] + [np.arange(n_segments)])
+    start = np.concatenate([p[1] for p in pieces] + [np.ones(n_segments)])
+    points = np.concatenate([p[2] for p in pieces] + [ends])
+    order = np.lexsort((start, segment))
+    offsets = np.zeros(n_segments + 1, dtype=np.int64)
+    np.cumsum(np.bincount(segment, minlength=n_segments), out=offsets[1:])
+    return (points[order].reshape(-1, 2), offsets)
+
+
+def _split(control: 'np.array') -> 'tuple':
+    """Split (S, d+1, 2) Bezier segments in halves by de Casteljau."""
+    left = [control[:, 0]]
+    right = [control[:, -1]]
+    level = control
+    while level.shape[1] > 1:
+        level = (level[:, :-1] + level[:, 1:]) / 2
+        left.append(level[:, 0])
+        right.append(level[:, -1])
+    return (np.stack(left, axis=1), np.stack(right[::-1], axis=1))